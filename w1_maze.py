@@ -66,7 +66,8 @@ def solve_dfs(start_pos):
     return False
 
 # Start the robot at the top-left corner (0, 0)
-solve_dfs((0, 0))
+if __name__ == "__main__":
+    solve_dfs((0, 0))
 
 ### **What's Happening Here?**
 
@@ -88,6 +89,7 @@ solve_dfs((0, 0))
 # 7. **Finding the Exit**: If the robot finds the exit (`9`), it prints "EXIT FOUND!" and we're done!
 # 
 # 8. **The Hack**: Try turning DFS into **Breadth-First Search (BFS)**! Observe how the "Checking square" order changes. Which one feels more 'organized'? BFS is the safe bet; DFS is the YOLO move. Choose your fighter.
+#    (Big mazes? `w1_maze_engine.solve(maze, start, mode="bfs")` does both on any-sized NumPy grid.)
 # def solve_bfs(start_pos):
 #     queue = [start_pos]               # start with (0,0) at the front of the line
 #     visited = set()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MAZE ENGINE (The "Big Wave" Edition) 🌊
+
+`w1_maze.py` is the grommet version: a hard-coded 5x5 maze, a set of tuples for
+"visited" and a print on every square. Cute for 25 squares, cooked for 4 million.
+
+This engine is the pro board:
+- Takes ANY-shaped NumPy grid (0 = Path, 1 = Wall, 9 = Exit), not just 5x5.
+- Turns every (row, col) into ONE integer (a "flat index"), so no tuples get built.
+- Remembers visited squares in a `bytearray` (1 byte per square, no hashing).
+- Only prints when you ask it to (`trace=True`) - printing is the slowest thing in the loop.
+- DFS and BFS are the SAME function, you just flip `mode`.
+- Mazes can live on disk in a tiny binary format (`save_maze` / `open_maze`)
+  and get memory-mapped, so a 5 GB maze never has to fit in RAM.
+
+JS Analogy:
+```js
+// Flat index = how you'd store a 2D grid in a Uint8Array:
+const i = row * width + col;
+const row = Math.floor(i / width), col = i % width;
+```
+"""
+
+# YOU NEED: pip install numpy
+import os
+import struct
+from collections import deque, namedtuple
+
+import numpy as np
+
+# Cell values (same as w1_maze.py)
+PATH = 0
+WALL = 1
+EXIT = 9
+
+# What the engine hands back:
+# - found: did we reach the exit?
+# - exit_pos: (row, col) of the exit we reached (None if no exit)
+# - expanded: how many squares we actually checked (the "work done")
+SearchResult = namedtuple("SearchResult", ["found", "exit_pos", "expanded"])
+
+# The on-disk maze format (".maze" files):
+#   bytes 0-3   b"MAZE"  (magic, so we don't memory-map your holiday photos)
+#   bytes 4-5   version  (uint16, little-endian)
+#   bytes 6-7   reserved (zero)
+#   bytes 8-15  height   (uint64)
+#   bytes 16-23 width    (uint64)
+#   bytes 24-31 padding  (so the cells start on a nice aligned offset)
+#   bytes 32-   height * width uint8 cells, row by row
+MAZE_MAGIC = b"MAZE"
+MAZE_VERSION = 1
+_HEADER = struct.Struct("<4sHHQQ8x")
+HEADER_SIZE = _HEADER.size
+
+
+def as_grid(maze):
+    """
+    Turn a maze into a 2D uint8 NumPy grid the engine can shred.
+
+    Accepts a list-of-lists (like `w1_maze.maze`), a NumPy array, or the
+    `w2_magic_compass.grid` style with 'S' and 'E' markers ('S' becomes a
+    path, 'E' becomes the exit). Arrays that are already 2D uint8 (including
+    a `numpy.memmap`) are passed through untouched - no copy.
+    """
+    if isinstance(maze, np.ndarray) and maze.dtype == np.uint8:
+        if maze.ndim != 2:
+            raise ValueError(f"Maze must be 2D, got shape {maze.shape}")
+        return maze
+
+    markers = {'S': PATH, 'E': EXIT}
+    rows = [[markers.get(cell, cell) for cell in row] for row in maze]
+    grid = np.asarray(rows, dtype=np.uint8)
+    if grid.ndim != 2:
+        raise ValueError(f"Maze must be 2D, got shape {grid.shape}")
+    return grid
+
+
+def flat_cells(grid):
+    """
+    A flat, zero-copy view of a uint8 grid that indexes to plain Python ints.
+
+    Indexing a NumPy array one cell at a time makes a NumPy scalar every
+    time, which is ~5x slower than a memoryview. For a memmap this stays
+    lazy, so pages only get read when the search actually touches them.
+    """
+    if not grid.flags.c_contiguous:
+        grid = np.ascontiguousarray(grid)
+    return memoryview(grid).cast('B')
+
+
+def solve(maze, start_pos, mode="dfs", goal=None, trace=False):
+    """
+    Find the exit with DFS or BFS on a grid of any size.
+
+    Args:
+        maze: 2D grid (NumPy array, memmap, or list-of-lists). 1 = Wall, 9 = Exit.
+        start_pos (tuple): (row, col) where the robot drops in.
+        mode (str): "dfs" (the YOLO stack) or "bfs" (the organised queue).
+        goal (tuple): Optional (row, col) to reach instead of any 9.
+        trace (bool): Print "Checking square" for every square (slow, for groms).
+
+    Returns:
+        SearchResult(found, exit_pos, expanded)
+
+    The DFS checks squares in exactly the same order as `w1_maze.solve_dfs`,
+    and the BFS in the same order as its commented-out `solve_bfs` - it's just
+    a `deque` instead of `list.pop(0)` (which shuffles the whole list every time).
+    """
+    if mode not in ("dfs", "bfs"):
+        raise ValueError(f"Unknown mode {mode!r}, pick 'dfs' or 'bfs'")
+
+    grid = as_grid(maze)
+    height, width = grid.shape
+    cells = flat_cells(grid)
+
+    sx, sy = start_pos
+    if not (0 <= sx < height and 0 <= sy < width):
+        raise ValueError(f"Start {start_pos} is outside the {height}x{width} maze")
+    if goal is not None:
+        gx, gy = goal
+        # Same check as the start: (0, -1) would otherwise become flat index
+        # -1, which secretly means "any exit"
+        if not (0 <= gx < height and 0 <= gy < width):
+            raise ValueError(f"Goal {goal} is outside the {height}x{width} maze")
+        target = gx * width + gy
+    else:
+        target = -1
+
+    # The "Checked" List: 1 byte per square instead of a tuple in a set
+    visited = bytearray(height * width)
+    last_col = width - 1
+    size = height * width
+
+    frontier = deque([sx * width + sy])
+    take = frontier.pop if mode == "dfs" else frontier.popleft
+    push = frontier.append
+    expanded = 0
+
+    while frontier:
+        i = take()
+        if visited[i]:
+            continue
+        visited[i] = 1
+        expanded += 1
+
+        if trace:
+            print(f"Checking square: ({i // width}, {i % width})")
+
+        if i == target or (target < 0 and cells[i] == EXIT):
+            if trace:
+                print("EXIT FOUND! W 🏁")
+            return SearchResult(True, divmod(i, width), expanded)
+
+        # Same neighbour order as solve_dfs: right, down, left, up.
+        # Up/down just fall off the ends of the flat array, but left/right
+        # need a column check so they don't wrap onto the next row.
+        col = i % width
+        n = i + 1
+        if col != last_col and not visited[n] and cells[n] != WALL:
+            push(n)
+        n = i + width
+        if n < size and not visited[n] and cells[n] != WALL:
+            push(n)
+        n = i - 1
+        if col != 0 and not visited[n] and cells[n] != WALL:
+            push(n)
+        n = i - width
+        if n >= 0 and not visited[n] and cells[n] != WALL:
+            push(n)
+
+    if trace:
+        print("NO EXIT FOUND 😢")
+    return SearchResult(False, None, expanded)
+
+
+def _write_header(f, height, width):
+    f.write(_HEADER.pack(MAZE_MAGIC, MAZE_VERSION, 0, height, width))
+
+
+def save_maze(path, maze, chunk_rows=1024):
+    """
+    Write a maze to disk in the `.maze` binary format.
+
+    Rows are written a chunk at a time, so saving a memory-mapped maze (or a
+    huge array) never makes a second full copy in RAM.
+    """
+    grid = as_grid(maze)
+    height, width = grid.shape
+    with open(path, "wb") as f:
+        _write_header(f, height, width)
+        for row in range(0, height, chunk_rows):
+            f.write(np.ascontiguousarray(grid[row:row + chunk_rows]).tobytes())
+
+
+def create_maze(path, height, width, fill=PATH):
+    """
+    Make a new `.maze` file and hand back a writable memory-mapped grid.
+
+    Great for generating monster mazes straight onto disk: the file starts as
+    all-`fill` squares, you paint walls into the returned array, then call
+    `.flush()` on it (or just drop it) to save.
+    """
+    with open(path, "wb") as f:
+        _write_header(f, height, width)
+        f.truncate(HEADER_SIZE + height * width)  # sparse zeros, no RAM used
+    grid = np.memmap(path, dtype=np.uint8, mode="r+", offset=HEADER_SIZE,
+                     shape=(height, width))
+    if fill != 0:
+        grid[:] = fill
+    return grid
+
+
+def open_maze(path, mode="r"):
+    """
+    Open a `.maze` file as a memory-mapped 2D uint8 grid.
+
+    Nothing is read up front except the 32-byte header - the OS pages cells in
+    as the search touches them. The result is a normal NumPy array, so pass it
+    straight to `solve`, `ReachabilityIndex`, or the A* solvers in week 2.
+
+    Args:
+        path: The `.maze` file.
+        mode (str): "r" for read-only (default), "r+" to edit walls in place,
+            "c" for copy-on-write (edits stay in RAM, file untouched).
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is too small to be a maze file")
+    magic, version, _, height, width = _HEADER.unpack(header)
+    if magic != MAZE_MAGIC:
+        raise ValueError(f"{path} is not a maze file (bad magic {magic!r})")
+    if version != MAZE_VERSION:
+        raise ValueError(f"{path} is maze format v{version}, we only speak v{MAZE_VERSION}")
+    expected = HEADER_SIZE + height * width
+    actual = os.path.getsize(path)
+    if actual != expected:
+        raise ValueError(f"{path} is {actual} bytes, header says it should be {expected}")
+    return np.memmap(path, dtype=np.uint8, mode=mode, offset=HEADER_SIZE,
+                     shape=(height, width))
+
+
+class ReachabilityIndex:
+    """
+    The "Island Map" for a maze: answer "can X reach Y?" without walking.
+
+    Every open square gets a label saying which "island" (connected region)
+    it belongs to. We paint the islands ONCE with a flood fill, and after that
+    "can start X reach the exit?" is just comparing two labels - no search.
+
+    Opening a wall (knocking down a brick) is cheap too: the new square glues
+    its neighbours' islands together with union-find, instead of repainting
+    the whole maze. (Building a NEW wall can split an island, which union-find
+    can't undo - call `rebuild()` for that.)
+
+    JS Analogy:
+    ```js
+    // Like precomputing a lookup table once:
+    const islandOf = new Int32Array(width * height);
+    const reachable = (a, b) => find(islandOf[a]) === find(islandOf[b]);
+    ```
+    """
+
+    def __init__(self, maze):
+        self.grid = as_grid(maze)
+        self.height, self.width = self.grid.shape
+        self.rebuild()
+
+    def rebuild(self):
+        """Repaint every island from scratch (one pass over the whole maze)."""
+        height, width = self.height, self.width
+        size = height * width
+        cells = flat_cells(self.grid)
+        last_col = width - 1
+
+        # -1 = wall, otherwise the island number of that square
+        self._label_array = np.full(size, -1, dtype=np.int32)
+        labels = memoryview(self._label_array)
+        self._labels = labels
+
+        # Union-find over island numbers (only used once walls get opened)
+        self._parent = []
+        self._size = []
+        self._has_exit = bytearray()
+
+        for seed in range(size):
+            if labels[seed] != -1 or cells[seed] == WALL:
+                continue
+            island = len(self._parent)
+            labels[seed] = island
+            stack = [seed]
+            count = 0
+            has_exit = 0
+            while stack:
+                i = stack.pop()
+                count += 1
+                if cells[i] == EXIT:
+                    has_exit = 1
+                col = i % width
+                n = i + 1
+                if col != last_col and labels[n] == -1 and cells[n] != WALL:
+                    labels[n] = island
+                    stack.append(n)
+                n = i + width
+                if n < size and labels[n] == -1 and cells[n] != WALL:
+                    labels[n] = island
+                    stack.append(n)
+                n = i - 1
+                if col != 0 and labels[n] == -1 and cells[n] != WALL:
+                    labels[n] = island
+                    stack.append(n)
+                n = i - width
+                if n >= 0 and labels[n] == -1 and cells[n] != WALL:
+                    labels[n] = island
+                    stack.append(n)
+            self._parent.append(island)
+            self._size.append(count)
+            self._has_exit.append(has_exit)
+
+        self.components = len(self._parent)
+
+    def _find(self, island):
+        # Follow parents to the root island, squashing the path as we go
+        parent = self._parent
+        root = island
+        while parent[root] != root:
+            root = parent[root]
+        while parent[island] != root:
+            parent[island], island = root, parent[island]
+        return root
+
+    def _union(self, a, b):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+        self._has_exit[a] |= self._has_exit[b]
+        self.components -= 1
+        return a
+
+    def _index(self, pos):
+        x, y = pos
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise ValueError(f"{pos} is outside the {self.height}x{self.width} maze")
+        return x * self.width + y
+
+    def component(self, pos):
+        """Island number of a square (-1 if it's a wall)."""
+        island = self._labels[self._index(pos)]
+        return -1 if island == -1 else self._find(island)
+
+    def connected(self, a, b):
+        """Can a robot at square `a` walk to square `b`?"""
+        island = self.component(a)
+        return island != -1 and island == self.component(b)
+
+    def can_reach_exit(self, start_pos):
+        """Can a robot dropped at `start_pos` reach ANY exit (9)?"""
+        island = self.component(start_pos)
+        return island != -1 and bool(self._has_exit[island])
+
+    def open_cell(self, pos, value=PATH):
+        """
+        Knock down a wall at `pos` and merge the islands it now joins.
+
+        Costs O(4 * find) instead of a full rebuild. Pass `value=EXIT` if the
+        new square is an exit. The index's grid gets the new square too, so a
+        later `rebuild()` keeps it (a uint8 NumPy maze is shared, not copied,
+        so that one changes in place - unless it's read-only, then we copy).
+        """
+        i = self._index(pos)
+        if not self.grid.flags.writeable:
+            self.grid = self.grid.copy()
+        self.grid[i // self.width, i % self.width] = value
+        labels = self._labels
+        if labels[i] != -1:
+            if value == EXIT:
+                self._has_exit[self._find(labels[i])] = 1
+            return
+
+        island = len(self._parent)
+        self._parent.append(island)
+        self._size.append(1)
+        self._has_exit.append(1 if value == EXIT else 0)
+        self.components += 1
+        labels[i] = island
+
+        width = self.width
+        col = i % width
+        neighbours = []
+        if col != width - 1:
+            neighbours.append(i + 1)
+        if i + width < self.height * width:
+            neighbours.append(i + width)
+        if col != 0:
+            neighbours.append(i - 1)
+        if i - width >= 0:
+            neighbours.append(i - width)
+        for n in neighbours:
+            if labels[n] != -1:
+                island = self._union(island, labels[n])
+
+
+if __name__ == "__main__":
+    # Let's shred: the tiny maze first (with tracing), then a big one (without).
+    import time
+
+    from w1_maze import maze
+
+    print("=== DFS on the w1 maze ===")
+    print(solve(maze, (0, 0), mode="dfs", trace=True))
+    print("\n=== BFS on the w1 maze ===")
+    print(solve(maze, (0, 0), mode="bfs", trace=True))
+
+    rng = np.random.default_rng(42)
+    big = (rng.random((2000, 2000)) < 0.3).astype(np.uint8)
+    big[0, 0] = PATH
+    big[-1, -1] = EXIT
+    for mode in ("dfs", "bfs"):
+        t0 = time.time()
+        result = solve(big, (0, 0), mode=mode)
+        print(f"2000x2000 {mode.upper()}: {result} in {time.time() - t0:.2f}s")
+
+    t0 = time.time()
+    index = ReachabilityIndex(big)
+    print(f"Island map: {index.components} islands painted in {time.time() - t0:.2f}s")
+    t0 = time.time()
+    hits = sum(index.can_reach_exit((r, r)) for r in range(0, 2000, 2))
+    print(f"1000 'can I reach the exit?' queries: {hits} yes in {time.time() - t0:.4f}s")
+
+    # Round-trip the big maze through disk and solve it straight off the memmap
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.maze")
+        save_maze(path, big)
+        on_disk = open_maze(path)
+        t0 = time.time()
+        print(f"Memory-mapped DFS: {solve(on_disk, (0, 0))} in {time.time() - t0:.2f}s")
+        del on_disk
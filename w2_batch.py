@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+BATCH COMPASS: The "Whole Surf Club Paddles Out At Once" 🏄‍♀️🏄🏄‍♂️
+
+Thousands of (start, end) questions against ONE map, answered one at a time
+on one CPU core, is like a surf club with 8 boards where only 1 kid is ever
+allowed in the water. This module hands the questions out to a whole crew:
+
+- The grid goes into `multiprocessing.shared_memory` ONCE. Every worker
+  process looks at the same bytes - no copying a 100 MB map into each worker,
+  no pickling it with every question.
+- Questions are cut into chunks (so we don't pay process-chatter per query)
+  and handed out as workers free up (so one slow chunk doesn't hold up the rest).
+- Answers come back as a NumPy array of path lengths (-1 = no path), plus
+  the actual paths if you ask for them.
+
+JS Analogy:
+```js
+// Like a pool of Web Workers reading the same SharedArrayBuffer:
+const shared = new SharedArrayBuffer(width * height);
+workers.forEach(w => w.postMessage({ shared, chunk }));
+```
+"""
+
+# YOU NEED: pip install numpy
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from w1_maze_engine import WALL, as_grid
+from w2_compass_engine import solve_a_star, solve_jps
+
+SOLVERS = {"a_star": solve_a_star, "jps": solve_jps}
+
+# Each worker process keeps these after `_attach` runs (one per process)
+_worker_grid = None
+_worker_shm = None
+
+
+def _attach(shm_name, shape):
+    # Pool initializer: map the shared grid into this worker (zero-copy)
+    global _worker_grid, _worker_shm
+    try:
+        # Python 3.13+: don't let this worker's resource tracker "clean up"
+        # (unlink) the parent's memory when the worker exits
+        _worker_shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:
+        _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_grid = np.ndarray(shape, dtype=np.uint8, buffer=_worker_shm.buf)
+
+
+def _solve_chunk(job):
+    # Answer one chunk of queries against the shared grid
+    offset, chunk, solver_name, want_paths = job
+    solver = SOLVERS[solver_name]
+    lengths = np.empty(len(chunk), dtype=np.int32)
+    paths = [] if want_paths else None
+    for k, (sr, sc, er, ec) in enumerate(chunk.tolist()):
+        result = solver((sr, sc), (er, ec), _worker_grid)
+        lengths[k] = result.length
+        if want_paths:
+            paths.append(result.path)
+    return offset, lengths, paths
+
+
+def _as_queries(queries, grid):
+    # Turn queries into an (N, 4) int array [start_row, start_col, end_row, end_col]
+    # and complain up front about any that are off the map or inside a wall
+    q = np.asarray(queries, dtype=np.int64).reshape(-1, 4)
+    height, width = grid.shape
+    rows, cols = q[:, [0, 2]], q[:, [1, 3]]
+    outside = ((rows < 0) | (rows >= height) | (cols < 0) | (cols >= width)).any(axis=1)
+    if outside.any():
+        bad = int(np.flatnonzero(outside)[0])
+        raise ValueError(f"Query {bad} {q[bad].tolist()} is outside the {height}x{width} grid")
+    walled = (grid[rows, cols] == WALL).any(axis=1)
+    if walled.any():
+        bad = int(np.flatnonzero(walled)[0])
+        raise ValueError(f"Query {bad} {q[bad].tolist()} starts or ends inside a wall")
+    return q
+
+
+def solve_batch(grid, queries, workers=None, chunksize=None, want_paths=False, solver="a_star"):
+    """
+    Answer a whole batch of shortest-path questions on one grid, in parallel.
+
+    Args:
+        grid: 2D grid (list-of-lists, NumPy array, or memmap). 1 = Wall.
+        queries: Anything shaped like (N, 4) or (N, 2, 2):
+            [[start_row, start_col, end_row, end_col], ...]
+        workers (int): How many processes (default: every CPU core).
+            `workers=1` runs in this process, no pool, no shared memory.
+        chunksize (int): Queries per job (default: about 4 jobs per worker,
+            so fast workers can pick up the slack of slow ones).
+        want_paths (bool): Also return every path (costs pickling them back).
+        solver (str): "a_star" or "jps" (both give shortest paths).
+
+    Returns:
+        lengths (np.int32 array of N, -1 = no path), or
+        (lengths, paths) if `want_paths` - paths is a list of [(row, col), ...].
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, pick one of {sorted(SOLVERS)}")
+    grid = np.ascontiguousarray(as_grid(grid))
+    q = _as_queries(queries, grid)
+    n = len(q)
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, n))
+    if chunksize is None:
+        chunksize = max(1, -(-n // (workers * 4)))
+
+    lengths = np.full(n, -1, dtype=np.int32)
+    paths = [None] * n if want_paths else None
+    jobs = [(start, q[start:start + chunksize], solver, want_paths)
+            for start in range(0, n, chunksize)]
+
+    def collect(done):
+        offset, chunk_lengths, chunk_paths = done
+        lengths[offset:offset + len(chunk_lengths)] = chunk_lengths
+        if want_paths:
+            paths[offset:offset + len(chunk_paths)] = chunk_paths
+
+    if workers == 1:
+        # Solo session: same code path, but no processes to spin up
+        global _worker_grid
+        _worker_grid = grid
+        try:
+            for job in jobs:
+                collect(_solve_chunk(job))
+        finally:
+            _worker_grid = None
+        return (lengths, paths) if want_paths else lengths
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, grid.nbytes))
+    try:
+        np.ndarray(grid.shape, dtype=np.uint8, buffer=shm.buf)[:] = grid
+        with Pool(workers, initializer=_attach, initargs=(shm.name, grid.shape)) as pool:
+            for done in pool.imap_unordered(_solve_chunk, jobs):
+                collect(done)
+    finally:
+        shm.close()
+        shm.unlink()
+    return (lengths, paths) if want_paths else lengths
+
+
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(5)
+    big = (rng.random((300, 300)) < 0.25).astype(np.uint8)
+    open_squares = np.argwhere(big != WALL)
+    picks = open_squares[rng.integers(0, len(open_squares), size=(200, 2))]
+    queries = picks.reshape(-1, 4)
+
+    baseline = None
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        t0 = time.time()
+        lengths = solve_batch(big, queries, workers=workers)
+        took = time.time() - t0
+        baseline = baseline or took
+        print(f"{workers} worker(s): {len(queries)} queries in {took:.2f}s "
+              f"({len(queries) / took:.0f} q/s, {baseline / took:.1f}x), "
+              f"{int((lengths >= 0).sum())} reachable")
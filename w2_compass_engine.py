@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MAGIC COMPASS ENGINE (The "Pro Tour" A*) 🧭
+
+`w2_magic_compass.solve_a_star` is the learner's board. It works, but on a
+1000x1000 reef it:
+- Shoves EVERY neighbour into the lineup, even when we already know a faster
+  way there (so the heap fills up with stale duplicates).
+- Only says True/False - no actual path to paddle.
+- Prints a surf report on every single wave.
+
+This engine keeps the same compass (Manhattan distance, like `get_distance`)
+but surfs smarter:
+- Squares are flat integers (row * width + col), just like `w1_maze_engine`.
+- `best_g` remembers the cheapest known paddle to every square, and we only
+  push a square when we beat that (no dominated duplicates).
+- A `parent` array remembers where we came from, so we can rebuild the path.
+- Counters (expanded, pushes, stale pops, heap high-water mark) instead of prints.
+- `solve_jps` (Jump Point Search) for big open water: same answers, a tiny
+  fraction of the heap traffic.
+- `build_landmarks` (ALT) for lots of queries on one map: a much sharper
+  compass than Manhattan, precomputed once and cached on disk.
+
+JS Analogy:
+```js
+// best_g is like a Map you check before enqueueing:
+if (newG < (bestG.get(next) ?? Infinity)) { bestG.set(next, newG); queue.push(next); }
+```
+"""
+
+# YOU NEED: pip install numpy
+import hashlib
+import heapq
+import os
+from array import array
+from collections import deque, namedtuple
+
+import numpy as np
+
+from w1_maze_engine import WALL, as_grid, flat_cells
+from w2_magic_compass import get_distance
+
+# Bigger than any real path length (fits in a signed 32-bit array slot)
+UNSEEN = 2 ** 31 - 1
+
+# What the engine hands back:
+# - found: did we reach the exit?
+# - path: list of (row, col) from start to end (empty if no path)
+# - length: number of moves on the path (-1 if no path)
+# - expanded: squares popped and explored (the "Checking ..." lines of the original)
+# - pushes: heap pushes (how many waves joined the lineup)
+# - stale_pops: pops we threw away because a cheaper route was already known
+# - heap_peak: the biggest the lineup ever got (memory high-water mark)
+PathResult = namedtuple(
+    "PathResult",
+    ["found", "path", "length", "expanded", "pushes", "stale_pops", "heap_peak"],
+)
+
+
+def check_cell(pos, height, width, cells, name):
+    """Flat index of `pos`, or a ValueError if it's off the grid or inside a wall."""
+    # Plain ints, even for NumPy coordinates (say, straight from np.argwhere):
+    # NumPy ints turn comparisons into NumPy bools, and those can't subtract
+    x, y = (int(v) for v in pos)
+    if not (0 <= x < height and 0 <= y < width):
+        raise ValueError(f"{name} {pos} is outside the {height}x{width} grid")
+    if cells[x * width + y] == WALL:
+        raise ValueError(f"{name} {pos} is inside a wall")
+    return x * width + y
+
+
+def reconstruct_path(parent, goal, width):
+    """Walk the `parent` array back from `goal` and return [(row, col), ...] start-first."""
+    path = []
+    i = goal
+    while i != -1:
+        path.append(divmod(i, width))
+        i = parent[i]
+    path.reverse()
+    return path
+
+
+def solve_a_star(start, end, grid, heuristic=None):
+    """
+    Production A*: shortest path on a 4-connected grid with path + counters.
+
+    Args:
+        start (tuple): (row, col) where we drop in.
+        end (tuple): (row, col) of the barrel we're chasing.
+        grid: 2D grid (list-of-lists, NumPy array, or memmap). 1 = Wall, anything else = water.
+        heuristic: Optional compass `heuristic(pos, goal)` with the same signature
+            as `get_distance`. Leave it as None for the built-in Manhattan
+            compass (same numbers as `get_distance`, just inlined for speed).
+            It must never overestimate, or the path might not be the shortest.
+            If the compass has a `bind(goal, width)` method (like `Landmarks`),
+            we ask it for a fast flat-index version `h(i)` for this goal instead.
+
+    Returns:
+        PathResult(found, path, length, expanded, pushes, stale_pops, heap_peak)
+
+    Ties on F are broken towards the square with the smaller H (closest to
+    the exit), which stops A* from fanning out sideways on open water.
+    """
+    grid = as_grid(grid)
+    height, width = grid.shape
+    cells = flat_cells(grid)
+    size = height * width
+    last_col = width - 1
+
+    s = check_cell(start, height, width, cells, "Start")
+    t = check_cell(end, height, width, cells, "End")
+    gr, gc = end
+
+    if heuristic is None:
+        def h_of(i):
+            r, c = divmod(i, width)
+            return abs(r - gr) + abs(c - gc)
+    elif hasattr(heuristic, "bind"):
+        h_of = heuristic.bind(end, width)
+    else:
+        def h_of(i):
+            return heuristic(divmod(i, width), end)
+
+    best_g = array('i', [UNSEEN]) * size   # Cheapest known paddle to each square
+    parent = array('i', [-1]) * size       # Where we came from (for the path)
+    closed = bytearray(size)               # Already surfed (the visited set)
+
+    best_g[s] = 0
+    h = h_of(s)
+    frontier = [(h, h, s)]  # (F, H, square) - G lives in best_g
+    pushes = 1
+    heap_peak = 1
+    expanded = 0
+    stale_pops = 0
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    while frontier:
+        _, _, i = heappop(frontier)
+        if closed[i]:
+            # A stale duplicate: a cheaper route to this square already won
+            stale_pops += 1
+            continue
+        closed[i] = 1
+        expanded += 1
+
+        if i == t:
+            path = reconstruct_path(parent, t, width)
+            return PathResult(True, path, best_g[t], expanded, pushes, stale_pops, heap_peak)
+
+        new_g = best_g[i] + 1
+        col = i % width
+        for n, ok in (
+            (i + 1, col != last_col),
+            (i + width, i + width < size),
+            (i - 1, col != 0),
+            (i - width, i >= width),
+        ):
+            # Only join the lineup if this is the cheapest way there so far
+            if ok and new_g < best_g[n] and not closed[n] and cells[n] != WALL:
+                best_g[n] = new_g
+                parent[n] = i
+                h = h_of(n)
+                heappush(frontier, (new_g + h, h, n))
+                pushes += 1
+                if len(frontier) > heap_peak:
+                    heap_peak = len(frontier)
+
+    return PathResult(False, [], -1, expanded, pushes, stale_pops, heap_peak)
+
+
+def _straight_path(jump_points):
+    # Fill in the squares between consecutive jump points (always a straight line)
+    path = [jump_points[0]]
+    for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+def solve_jps(start, end, grid):
+    """
+    Jump Point Search: A* that skips the boring open water. 🏄
+
+    Plain A* on a wide-open map pushes nearly every square into the lineup.
+    JPS instead "jumps" in a straight line until something interesting
+    happens (a wall corner opens up a new route, or we hit the exit), and
+    only those "jump points" ever go into the heap. Same shortest paths,
+    way fewer heap operations.
+
+    This is the 4-connected version (no diagonals, same as our grids):
+    - Moving sideways, we keep going until a square above/below opens up
+      right after a wall (a "forced neighbour") - that square is a jump point.
+    - Moving up/down acts like a diagonal in classic 8-way JPS: at every
+      step we peek sideways, and if a sideways jump finds something, we stop.
+    - Paths are "turn vertical as early as possible", so ties between equally
+      short routes get pruned instead of explored.
+
+    Uses the same `get_distance` compass and grid format as `solve_a_star`.
+
+    Returns:
+        PathResult(found, path, length, expanded, pushes, stale_pops, heap_peak)
+        where `expanded`/`pushes` count jump points, not squares.
+    """
+    grid = as_grid(grid)
+    height, width = grid.shape
+    cells = flat_cells(grid)
+    s = check_cell(start, height, width, cells, "Start")
+    t = check_cell(end, height, width, cells, "End")
+
+    def is_open(r, c):
+        return 0 <= r < height and 0 <= c < width and cells[r * width + c] != WALL
+
+    def jump_sideways(r, c, dc):
+        # Slide along the row; return the column of the next jump point or -1
+        row_start = r * width
+        row_end = row_start + width
+        has_up = r > 0
+        has_down = r < height - 1
+        i = row_start + c
+        while True:
+            i += dc
+            if not (row_start <= i < row_end) or cells[i] == WALL:
+                return -1
+            if i == t:
+                return i - row_start
+            # Forced neighbour: the square above/below is open, but the one
+            # above/below where we just came from was a wall
+            if has_up and cells[i - width] != WALL and cells[i - width - dc] == WALL:
+                return i - row_start
+            if has_down and cells[i + width] != WALL and cells[i + width - dc] == WALL:
+                return i - row_start
+
+    def jump_vertical(r, c, dr):
+        # Slide along the column, peeking sideways at every step
+        while True:
+            r += dr
+            if not (0 <= r < height) or cells[r * width + c] == WALL:
+                return -1
+            if r * width + c == t or jump_sideways(r, c, 1) != -1 or jump_sideways(r, c, -1) != -1:
+                return r
+
+    best_g = {s: 0}
+    parent = {s: -1}
+    closed = set()
+    h = get_distance(start, end)
+    frontier = [(h, h, s)]
+    pushes = 1
+    heap_peak = 1
+    expanded = 0
+    stale_pops = 0
+
+    while frontier:
+        _, _, i = heapq.heappop(frontier)
+        if i in closed:
+            stale_pops += 1
+            continue
+        closed.add(i)
+        expanded += 1
+
+        if i == t:
+            path = _straight_path(reconstruct_path(parent, t, width))
+            return PathResult(True, path, best_g[t], expanded, pushes, stale_pops, heap_peak)
+
+        r, c = divmod(i, width)
+        p = parent[i]
+        if p == -1:
+            directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        else:
+            pr, pc = divmod(p, width)
+            dr = (r > pr) - (r < pr)
+            dc = (c > pc) - (c < pc)
+            if dr:
+                # Arrived vertically: keep going, or peel off either side
+                directions = [(dr, 0), (0, 1), (0, -1)]
+            else:
+                # Arrived sideways: keep going, plus any forced turns
+                directions = [(0, dc)]
+                for turn in (-1, 1):
+                    if is_open(r + turn, c) and not is_open(r + turn, c - dc):
+                        directions.append((turn, 0))
+
+        g = best_g[i]
+        for dr, dc in directions:
+            if dr:
+                jr = jump_vertical(r, c, dr)
+                if jr == -1:
+                    continue
+                n, new_g = jr * width + c, g + abs(jr - r)
+            else:
+                jc = jump_sideways(r, c, dc)
+                if jc == -1:
+                    continue
+                n, new_g = r * width + jc, g + abs(jc - c)
+            if n in closed or new_g >= best_g.get(n, UNSEEN):
+                continue
+            best_g[n] = new_g
+            parent[n] = i
+            h = get_distance(divmod(n, width), end)
+            heapq.heappush(frontier, (new_g + h, h, n))
+            pushes += 1
+            if len(frontier) > heap_peak:
+                heap_peak = len(frontier)
+
+    return PathResult(False, [], -1, expanded, pushes, stale_pops, heap_peak)
+
+
+def bfs_distances(grid, source):
+    """
+    Paddle distance from `source` to EVERY square (one BFS flood).
+
+    Returns a flat int32 NumPy array (index = row * width + col) where walls
+    and squares you can't reach are -1.
+    """
+    grid = as_grid(grid)
+    height, width = grid.shape
+    cells = flat_cells(grid)
+    size = height * width
+    last_col = width - 1
+
+    s = check_cell(source, height, width, cells, "Source")
+    dist = array('i', [-1]) * size
+    dist[s] = 0
+    queue = deque([s])
+    while queue:
+        i = queue.popleft()
+        d = dist[i] + 1
+        col = i % width
+        n = i + 1
+        if col != last_col and dist[n] == -1 and cells[n] != WALL:
+            dist[n] = d
+            queue.append(n)
+        n = i + width
+        if n < size and dist[n] == -1 and cells[n] != WALL:
+            dist[n] = d
+            queue.append(n)
+        n = i - 1
+        if col != 0 and dist[n] == -1 and cells[n] != WALL:
+            dist[n] = d
+            queue.append(n)
+        n = i - width
+        if n >= 0 and dist[n] == -1 and cells[n] != WALL:
+            dist[n] = d
+            queue.append(n)
+    return np.frombuffer(dist, dtype=np.int32)
+
+
+def grid_hash(grid):
+    """A fingerprint of the grid (shape + every square), used as the cache key."""
+    grid = np.ascontiguousarray(as_grid(grid))
+    digest = hashlib.sha1(f"{grid.shape}".encode())
+    digest.update(memoryview(grid).cast('B'))
+    return digest.hexdigest()
+
+
+class Landmarks:
+    """
+    The ALT compass: "A*, Landmarks, Triangle inequality". 🗼
+
+    Manhattan distance is a kook on a maze with long walls - it thinks the
+    exit is 3 squares away when you actually have to paddle 300 around the reef.
+    Landmarks fix that. We pick K squares (the "lighthouses"), and BFS once
+    from each one to learn the TRUE distance to every square. Then for any
+    square `n` and goal `t`, the triangle inequality promises:
+
+        real_distance(n, t) >= |dist(L, t) - dist(L, n)|   for every lighthouse L
+
+    The biggest of those numbers (and Manhattan) is still never an
+    overestimate, so A* stays optimal - it just explores way less.
+
+    Call it like `get_distance`: `landmarks((row, col), goal)`, or hand it to
+    `solve_a_star(..., heuristic=landmarks)`.
+    """
+
+    def __init__(self, shape, landmarks, tables):
+        self.height, self.width = shape
+        self.landmarks = [tuple(int(v) for v in lm) for lm in landmarks]
+        # (K, height * width) array of distances, `unreachable` where -1 before
+        self.tables = tables
+        self.unreachable = np.iinfo(tables.dtype).max
+        self._rows = [memoryview(np.ascontiguousarray(row)) for row in tables]
+
+    def __call__(self, pos, goal):
+        width = self.width
+        i = pos[0] * width + pos[1]
+        t = goal[0] * width + goal[1]
+        unreachable = self.unreachable
+        best = abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
+        for row in self._rows:
+            di, dt = row[i], row[t]
+            if di == unreachable or dt == unreachable:
+                continue  # This lighthouse can't see one of them, no info
+            bound = di - dt if di > dt else dt - di
+            if bound > best:
+                best = bound
+        return best
+
+    def bind(self, goal, width):
+        """
+        Lock the compass onto one goal: returns `h(i)` over flat square indices.
+
+        The goal's distance to each lighthouse is looked up once here, instead
+        of on every single push. `width` must match the grid we were built on.
+        """
+        if width != self.width:
+            raise ValueError(f"Landmarks were built for width {self.width}, not {width}")
+        gr, gc = goal
+        t = gr * width + gc
+        unreachable = self.unreachable
+        lighthouses = [(row, row[t]) for row in self._rows if row[t] != unreachable]
+
+        def h(i):
+            r, c = divmod(i, width)
+            best = abs(r - gr) + abs(c - gc)
+            for row, dt in lighthouses:
+                di = row[i]
+                if di != unreachable:
+                    bound = di - dt if di > dt else dt - di
+                    if bound > best:
+                        best = bound
+            return best
+
+        return h
+
+
+def _compact(tables):
+    # Store distances in the smallest unsigned type that fits; the top value
+    # of that type means "unreachable" (instead of -1)
+    reach = tables[tables >= 0]
+    longest = int(reach.max()) if reach.size else 0
+    dtype = np.uint16 if longest < np.iinfo(np.uint16).max else np.uint32
+    out = tables.astype(dtype)
+    out[tables < 0] = np.iinfo(dtype).max
+    return out
+
+
+def build_landmarks(grid, k=8, cache_dir=None):
+    """
+    Pick `k` lighthouses and precompute their distance tables (once per grid).
+
+    Lighthouses are chosen "farthest first": each new one is the square that
+    is furthest from all the lighthouses we already have, so they end up
+    spread around the edges of the map, where they give the sharpest bounds.
+
+    Args:
+        grid: 2D grid (list-of-lists, NumPy array, or memmap). 1 = Wall.
+        k (int): How many lighthouses (more = sharper compass, more memory).
+        cache_dir (str): If set, tables are saved there as
+            `alt-<grid hash>-k<k>.npz` and loaded back on the next run
+            instead of being recomputed.
+
+    Returns:
+        Landmarks - a compass you can pass as `heuristic=` to `solve_a_star`.
+    """
+    grid = as_grid(grid)
+    shape = grid.shape
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"alt-{grid_hash(grid)}-k{k}.npz")
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as saved:
+                return Landmarks(shape, saved["landmarks"], saved["tables"])
+
+    flat = np.asarray(grid).reshape(-1)
+    open_squares = np.flatnonzero(flat != WALL)
+    if open_squares.size == 0:
+        raise ValueError("Grid has no open squares to put a landmark on")
+
+    # How far each square is from its nearest lighthouse so far
+    # (walls can never be picked; squares nobody can reach yet look "infinitely" far)
+    nearest = np.where(flat == WALL, -1, np.iinfo(np.int64).max).astype(np.int64)
+    seed = divmod(int(open_squares[0]), shape[1])
+    first = bfs_distances(grid, seed)
+    pick = int(np.argmax(first))  # The square furthest from the seed
+
+    landmarks, tables = [], []
+    for _ in range(min(k, open_squares.size)):
+        pos = divmod(pick, shape[1])
+        dist = bfs_distances(grid, pos)
+        landmarks.append(pos)
+        tables.append(dist)
+        nearest = np.where(dist >= 0, np.minimum(nearest, dist), nearest)
+        pick = int(np.argmax(nearest))
+
+    result = Landmarks(shape, np.array(landmarks), _compact(np.stack(tables)))
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(cache_path, landmarks=np.array(result.landmarks), tables=result.tables)
+    return result
+
+
+if __name__ == "__main__":
+    import time
+
+    from w2_magic_compass import grid as tiny_grid
+
+    print("=== PRO COMPASS on the w2 grid ===")
+    print(solve_a_star((0, 0), (4, 4), tiny_grid))
+    print(solve_a_star((0, 0), (4, 4), tiny_grid, heuristic=get_distance))
+
+    rng = np.random.default_rng(7)
+    big = (rng.random((1000, 1000)) < 0.25).astype(np.uint8)
+    big[0, 0] = big[-1, -1] = 0
+    t0 = time.time()
+    result = solve_a_star((0, 0), (999, 999), big)
+    print(f"\n1000x1000: length={result.length} expanded={result.expanded} "
+          f"pushes={result.pushes} stale_pops={result.stale_pops} "
+          f"heap_peak={result.heap_peak} in {time.time() - t0:.2f}s")
+
+    # Open water with one long reef: A* floods half the map, JPS just jumps
+    reef = np.zeros((1000, 1000), dtype=np.uint8)
+    reef[500, 100:] = 1
+    for solver in (solve_a_star, solve_jps):
+        t0 = time.time()
+        result = solver((999, 999), (0, 999), reef)
+        print(f"{solver.__name__}: length={result.length} expanded={result.expanded} "
+              f"pushes={result.pushes} in {time.time() - t0:.2f}s")
+
+    # Same reef, many queries: build the lighthouses once (cached on disk),
+    # then every A* query gets the sharp ALT compass for free
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as cache:
+        t0 = time.time()
+        landmarks = build_landmarks(reef, k=8, cache_dir=cache)
+        print(f"\nALT tables for {landmarks.landmarks} built in {time.time() - t0:.2f}s")
+        t0 = time.time()
+        landmarks = build_landmarks(reef, k=8, cache_dir=cache)
+        print(f"...and loaded back from the cache in {time.time() - t0:.3f}s")
+    for name, compass in (("Manhattan", None), ("ALT", landmarks)):
+        t0 = time.time()
+        result = solve_a_star((999, 999), (0, 999), reef, heuristic=compass)
+        print(f"{name}: length={result.length} expanded={result.expanded} "
+              f"in {time.time() - t0:.2f}s")
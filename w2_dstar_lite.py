@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+D* LITE: The "Reroute, Don't Restart" Compass 🔁
+
+You're paddling to the barrel and a rip shoves a sandbank into your way.
+`solve_a_star` would throw away everything it knew and start over from
+scratch. D* Lite is the local who goes "nah, only the bit near the sandbank
+changed" and fixes JUST that part of the plan.
+
+How it works (the short version):
+- It searches BACKWARDS, from the exit to you. So when you move, the plan
+  (distances to the exit) is still valid - only your position changed.
+- Every square keeps two numbers:
+    g   = the distance to the exit we currently believe
+    rhs = what a one-step lookahead says it should be (min over neighbours of 1 + g)
+  When they agree, the square is "consistent". When a wall changes, only the
+  squares whose numbers stop agreeing go back in the queue.
+- `km` is a little offset that lets old queue entries stay valid after you
+  move, instead of re-sorting the whole queue.
+
+Usage:
+```python
+planner = DStarLite(grid, start=(0, 0), goal=(99, 99))
+planner.plan()                              # first search (full cost)
+planner.move_to((0, 5))                     # the agent paddled a bit
+planner.update_cells([((3, 7), 1)])         # a new wall appeared
+planner.plan()                              # repairs only what changed
+```
+
+JS Analogy:
+```js
+// Like a React memo that only re-renders the components whose props changed,
+// instead of re-rendering the whole app.
+```
+"""
+
+# YOU NEED: pip install numpy
+import heapq
+from array import array
+
+from w1_maze_engine import WALL, as_grid, flat_cells
+from w2_compass_engine import UNSEEN, PathResult, check_cell
+
+INF = UNSEEN
+
+
+class DStarLite:
+    """
+    Incremental shortest-path planner on a 4-connected grid (1 = Wall).
+
+    The grid is used in place if it's a NumPy array (`update_cells` writes into
+    it), so everything else looking at that grid sees the same walls.
+    """
+
+    def __init__(self, grid, start, goal):
+        self.grid = as_grid(grid)
+        self.height, self.width = self.grid.shape
+        self._cells = flat_cells(self.grid)
+        size = self.height * self.width
+
+        self.start = check_cell(start, self.height, self.width, self._cells, "Start")
+        self.goal = check_cell(goal, self.height, self.width, self._cells, "Goal")
+        self._last = self.start
+        self.km = 0
+
+        # Running totals across every plan() call (heap_peak resets per call)
+        self.expanded = 0
+        self.pushes = 0
+        self.stale_pops = 0
+        self.heap_peak = 0
+
+        self._g = array('i', [INF]) * size
+        self._rhs = array('i', [INF]) * size
+        self._rhs[self.goal] = 0
+        self._queue = []
+        self._queued = {}  # square -> key it's currently queued with
+        self._push(self.goal, self._key(self.goal))
+
+    # --- The little helpers ---------------------------------------------
+
+    def _h(self, a, b):
+        # Manhattan compass between two flat squares (same as get_distance)
+        ar, ac = divmod(a, self.width)
+        br, bc = divmod(b, self.width)
+        return abs(ar - br) + abs(ac - bc)
+
+    def _key(self, u):
+        m = min(self._g[u], self._rhs[u])
+        if m == INF:
+            return (INF, INF)
+        return (m + self._h(self.start, u) + self.km, m)
+
+    def _neighbours(self, u):
+        width = self.width
+        col = u % width
+        if col + 1 < width:
+            yield u + 1
+        if u + width < self.height * width:
+            yield u + width
+        if col > 0:
+            yield u - 1
+        if u >= width:
+            yield u - width
+
+    def _push(self, u, key):
+        self._queued[u] = key
+        heapq.heappush(self._queue, (key, u))
+        self.pushes += 1
+        if len(self._queue) > self.heap_peak:
+            self.heap_peak = len(self._queue)
+
+    def _top(self):
+        # Peek the best live entry, throwing away stale ones on the way
+        queue, queued = self._queue, self._queued
+        while queue:
+            key, u = queue[0]
+            if queued.get(u) == key:
+                return key, u
+            heapq.heappop(queue)
+            self.stale_pops += 1
+        return (INF, INF), -1
+
+    def _update_vertex(self, u):
+        g, rhs, cells = self._g, self._rhs, self._cells
+        if u != self.goal:
+            if cells[u] == WALL:
+                rhs[u] = INF
+            else:
+                best = INF
+                for n in self._neighbours(u):
+                    if cells[n] != WALL and g[n] < best:
+                        best = g[n]
+                rhs[u] = best + 1 if best < INF else INF
+        self._queued.pop(u, None)  # Lazy delete: any old heap entry goes stale
+        if g[u] != rhs[u]:
+            self._push(u, self._key(u))
+
+    # --- Public API -----------------------------------------------------
+
+    def move_to(self, pos):
+        """The agent moved to `pos` (keep the plan, just shift the offset)."""
+        self.start = check_cell(pos, self.height, self.width, self._cells, "Start")
+
+    def update_cells(self, changes):
+        """
+        Apply a batch of square changes: iterable of ((row, col), value).
+
+        Only the changed squares and their neighbours are re-checked here; the
+        next `plan()` call then repairs whatever actually got affected.
+        """
+        self.km += self._h(self._last, self.start)
+        self._last = self.start
+        dirty = set()
+        for (r, c), value in changes:
+            if not (0 <= r < self.height and 0 <= c < self.width):
+                raise ValueError(f"{(r, c)} is outside the {self.height}x{self.width} grid")
+            i = r * self.width + c
+            if (self._cells[i] == WALL) == (value == WALL):
+                self.grid[r, c] = value
+                continue  # Wall-ness didn't change, no edges changed
+            self.grid[r, c] = value
+            dirty.add(i)
+            dirty.update(self._neighbours(i))
+        for u in dirty:
+            self._update_vertex(u)
+
+    def plan(self):
+        """
+        (Re)compute the shortest path from the current start to the goal.
+
+        The first call is a full backwards search; later calls only process
+        squares that became inconsistent since. The counters in the result
+        are for THIS call only.
+
+        Returns:
+            PathResult(found, path, length, expanded, pushes, stale_pops, heap_peak)
+        """
+        before = (self.expanded, self.pushes, self.stale_pops)
+        self.heap_peak = len(self._queue)
+        g, rhs = self._g, self._rhs
+        start = self.start
+
+        while True:
+            top_key, u = self._top()
+            if u == -1:
+                break
+            if not (top_key < self._key(start) or rhs[start] != g[start]):
+                break
+            heapq.heappop(self._queue)
+            del self._queued[u]
+            new_key = self._key(u)
+            if top_key < new_key:
+                self._push(u, new_key)  # Key went stale after a move: requeue
+            elif g[u] > rhs[u]:
+                g[u] = rhs[u]  # Got better: tell the neighbours
+                self.expanded += 1
+                for n in self._neighbours(u):
+                    self._update_vertex(n)
+            else:
+                g[u] = INF  # Got worse: reset and let everyone recompute
+                self.expanded += 1
+                self._update_vertex(u)
+                for n in self._neighbours(u):
+                    self._update_vertex(n)
+
+        path = self.path()
+        counters = (self.expanded - before[0], self.pushes - before[1],
+                    self.stale_pops - before[2], self.heap_peak)
+        if not path:
+            return PathResult(False, [], -1, *counters)
+        return PathResult(True, path, len(path) - 1, *counters)
+
+    def path(self):
+        """Walk downhill on g from the start to the goal ([] if there's no way)."""
+        g, cells, width = self._g, self._cells, self.width
+        u = self.start
+        if g[u] == INF:
+            return []
+        path = [divmod(u, width)]
+        while u != self.goal:
+            best, best_g = -1, INF
+            for n in self._neighbours(u):
+                if cells[n] != WALL and g[n] < best_g:
+                    best, best_g = n, g[n]
+            if best == -1 or best_g >= g[u]:
+                return []  # Shouldn't happen after plan(); bail rather than loop
+            u = best
+            path.append(divmod(u, width))
+        return path
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+
+    from w2_compass_engine import solve_a_star
+
+    rng = np.random.default_rng(21)
+    big = (rng.random((500, 500)) < 0.25).astype(np.uint8)
+    big[0, 0] = big[-1, -1] = 0
+
+    planner = DStarLite(big, (0, 0), (499, 499))
+    t0 = time.time()
+    result = planner.plan()
+    print(f"First plan: length={result.length} expanded={result.expanded} "
+          f"in {time.time() - t0:.2f}s")
+
+    # Paddle 20 squares along the plan, then a few squares ahead get blocked
+    planner.move_to(result.path[20])
+    blocked = [(pos, 1) for pos in result.path[40:45]]
+    planner.update_cells(blocked)
+    t0 = time.time()
+    result = planner.plan()
+    print(f"Replan:     length={result.length} expanded={result.expanded} "
+          f"in {time.time() - t0:.3f}s")
+
+    t0 = time.time()
+    fresh = solve_a_star(result.path[0], (499, 499), big)
+    print(f"From-scratch A*: length={fresh.length} expanded={fresh.expanded} "
+          f"in {time.time() - t0:.3f}s")
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HIERARCHICAL COMPASS (HPA*: "Plan the Road Trip, Then the Streets") 🗺️
+
+On a 10,000 x 10,000 map even the pro `solve_a_star` has to look at millions
+of squares per query. But you don't plan a road trip from Sydney to Byron
+street by street - you pick the highway exits first, THEN sort out the
+streets at each end.
+
+HPA* does exactly that:
+1. Chop the grid into square "clusters" (suburbs), e.g. 32x32 squares each.
+2. Wherever two clusters share an open border, drop an "entrance" (a highway
+   exit): a pair of squares, one on each side, 1 move apart.
+3. Inside each cluster, BFS once to learn the distance between every pair of
+   its entrances. That's the small "abstract graph" (the highway map).
+4. A query plugs the start and end into their clusters, runs A* on the tiny
+   highway map, then "refines" each highway hop back into real squares.
+
+When a wall changes, only that square's cluster (and the neighbour across the
+border, if the square sits right on a border) gets recomputed.
+
+Paths are near-optimal (usually within a few percent of the true shortest),
+in exchange for queries that touch a tiny fraction of the map.
+
+JS Analogy:
+```js
+// The abstract graph is just an adjacency map between entrance squares:
+const highway = new Map();  // square -> Map(otherSquare -> cost)
+```
+"""
+
+# YOU NEED: pip install numpy
+import heapq
+from collections import deque
+
+from w1_maze_engine import WALL, as_grid, flat_cells
+from w2_compass_engine import PathResult, check_cell
+
+# Borders with an open stretch shorter than this get ONE entrance in the
+# middle; longer stretches get one at each end (the classic HPA* rule)
+MAX_ENTRANCE_WIDTH = 6
+
+
+class HierarchicalGrid:
+    """
+    A grid wrapped in a precomputed cluster/entrance abstraction.
+
+    Args:
+        grid: 2D grid (list-of-lists, NumPy array, or memmap). 1 = Wall.
+            A NumPy grid is used in place (not copied), and `set_cell` writes
+            into it, so keep it writable if you plan to change walls.
+        cluster_size (int): Side length of each square cluster.
+    """
+
+    def __init__(self, grid, cluster_size=32):
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+        self.grid = as_grid(grid)
+        self.height, self.width = self.grid.shape
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.height // cluster_size)
+        self.cluster_cols = -(-self.width // cluster_size)
+        self._cells = flat_cells(self.grid)
+
+        self._entrances = {}  # (cluster_a, cluster_b) -> [(square_a, square_b), ...]
+        self._nodes = {}      # cluster -> set of entrance squares inside it
+        self._partners = {}   # square -> {square across the border, ...}
+        self._intra = {}      # cluster -> {square: {other_square: distance}}
+
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                self._nodes[(cr, cc)] = set()
+        for cluster in list(self._nodes):
+            for neighbour in self._next_clusters(cluster):
+                self._build_border(cluster, neighbour)
+        for cluster in self._nodes:
+            self._build_cluster(cluster)
+
+    # --- Geometry -----------------------------------------------------------
+
+    def cluster_of(self, pos):
+        """Which cluster (cluster_row, cluster_col) a (row, col) square lives in."""
+        return (pos[0] // self.cluster_size, pos[1] // self.cluster_size)
+
+    def _bounds(self, cluster):
+        size = self.cluster_size
+        r0, c0 = cluster[0] * size, cluster[1] * size
+        return r0, min(r0 + size, self.height), c0, min(c0 + size, self.width)
+
+    def _next_clusters(self, cluster):
+        # The clusters to the right and below (each border is owned once)
+        cr, cc = cluster
+        if cc + 1 < self.cluster_cols:
+            yield (cr, cc + 1)
+        if cr + 1 < self.cluster_rows:
+            yield (cr + 1, cc)
+
+    # --- Building the highway map -------------------------------------------
+
+    def _build_border(self, a, b):
+        # Find the open stretches along the border between clusters a and b
+        # and drop entrance pairs on them
+        cells, width = self._cells, self.width
+        ar0, ar1, ac0, ac1 = self._bounds(a)
+        if a[0] == b[0]:
+            # Side by side: a's last column faces b's first column
+            pairs = [(r * width + ac1 - 1, r * width + ac1) for r in range(ar0, ar1)]
+        else:
+            # Stacked: a's last row faces b's first row
+            pairs = [((ar1 - 1) * width + c, ar1 * width + c) for c in range(ac0, ac1)]
+
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and cells[pair[0]] != WALL and cells[pair[1]] != WALL:
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < MAX_ENTRANCE_WIDTH:
+                    entrances.append(run[len(run) // 2])
+                else:
+                    entrances.append(run[0])
+                    entrances.append(run[-1])
+                run = []
+        self._entrances[(a, b)] = entrances
+
+        for sa, sb in entrances:
+            self._nodes[a].add(sa)
+            self._nodes[b].add(sb)
+            self._partners.setdefault(sa, set()).add(sb)
+            self._partners.setdefault(sb, set()).add(sa)
+
+    def _drop_border(self, a, b):
+        # Forget the entrances on one border (before rebuilding it)
+        for sa, sb in self._entrances.pop((a, b), []):
+            for square, other in ((sa, sb), (sb, sa)):
+                partners = self._partners.get(square)
+                if partners is not None:
+                    partners.discard(other)
+                    if not partners:
+                        del self._partners[square]
+        for cluster in (a, b):
+            self._nodes[cluster] = {
+                square for square in self._nodes[cluster] if square in self._partners
+            }
+
+    def _cluster_bfs(self, cluster, source, want_parents=False):
+        # BFS from `source` without leaving `cluster`; returns {square: distance}
+        # (and {square: parent} if asked)
+        cells, width = self._cells, self.width
+        r0, r1, c0, c1 = self._bounds(cluster)
+        dist = {source: 0}
+        parent = {source: -1}
+        queue = deque([source])
+        popleft, append = queue.popleft, queue.append
+        while queue:
+            i = popleft()
+            d = dist[i] + 1
+            r, c = divmod(i, width)
+            candidates = []
+            if c + 1 < c1:
+                candidates.append(i + 1)
+            if r + 1 < r1:
+                candidates.append(i + width)
+            if c > c0:
+                candidates.append(i - 1)
+            if r > r0:
+                candidates.append(i - width)
+            for n in candidates:
+                if n not in dist and cells[n] != WALL:
+                    dist[n] = d
+                    if want_parents:
+                        parent[n] = i
+                    append(n)
+        return (dist, parent) if want_parents else dist
+
+    def _build_cluster(self, cluster):
+        # Distances between every pair of entrances inside one cluster
+        nodes = self._nodes[cluster]
+        intra = {}
+        for square in nodes:
+            dist = self._cluster_bfs(cluster, square)
+            intra[square] = {other: dist[other] for other in nodes
+                             if other != square and other in dist}
+        self._intra[cluster] = intra
+
+    # --- Changing walls -----------------------------------------------------
+
+    def set_cell(self, pos, value):
+        """
+        Change one square (e.g. build a wall with 1, open one with 0).
+
+        Only the abstraction around that square gets recomputed: its own
+        cluster, plus the cluster across the border if the square sits on
+        one. Returns the set of clusters that were rebuilt.
+        """
+        r, c = pos
+        if not (0 <= r < self.height and 0 <= c < self.width):
+            raise ValueError(f"{pos} is outside the {self.height}x{self.width} grid")
+        self.grid[r, c] = value
+        self._cells = flat_cells(self.grid)
+
+        cluster = self.cluster_of(pos)
+        cr, cc = cluster
+        r0, r1, c0, c1 = self._bounds(cluster)
+        touched = {cluster}
+        borders = []
+        if c == c1 - 1 and cc + 1 < self.cluster_cols:
+            borders.append((cluster, (cr, cc + 1)))
+        if c == c0 and cc > 0:
+            borders.append(((cr, cc - 1), cluster))
+        if r == r1 - 1 and cr + 1 < self.cluster_rows:
+            borders.append((cluster, (cr + 1, cc)))
+        if r == r0 and cr > 0:
+            borders.append(((cr - 1, cc), cluster))
+
+        for a, b in borders:
+            self._drop_border(a, b)
+        for a, b in borders:
+            self._build_border(a, b)
+            touched.update((a, b))
+        for rebuilt in touched:
+            self._build_cluster(rebuilt)
+        return touched
+
+    # --- Queries ------------------------------------------------------------
+
+    def find_path(self, start, end):
+        """
+        Near-shortest path from `start` to `end` using the highway map.
+
+        Returns:
+            PathResult(found, path, length, expanded, pushes, stale_pops, heap_peak)
+            where the counters are for the small abstract graph search.
+        """
+        width = self.width
+        s = check_cell(start, self.height, width, self._cells, "Start")
+        t = check_cell(end, self.height, width, self._cells, "End")
+        cs, ct = self.cluster_of(start), self.cluster_of(end)
+        gr, gc = end
+
+        # Plug start and end into their clusters (temporary highway on-ramps)
+        from_start = self._cluster_bfs(cs, s)
+        start_edges = {node: from_start[node] for node in self._nodes[cs] if node in from_start}
+        to_end = self._cluster_bfs(ct, t)
+        if cs == ct and t in from_start:
+            start_edges[t] = from_start[t]  # Same suburb: the direct local route
+
+        def neighbours(u):
+            if u == s:
+                yield from start_edges.items()
+            cluster = (u // width // self.cluster_size, u % width // self.cluster_size)
+            for other, cost in self._intra[cluster].get(u, {}).items():
+                yield other, cost
+            for other in self._partners.get(u, ()):
+                yield other, 1
+            if cluster == ct and u in to_end and u != s:
+                yield t, to_end[u]
+
+        # A* on the abstract graph (Manhattan never overestimates here either)
+        best_g = {s: 0}
+        parent = {s: -1}
+        closed = set()
+        frontier = [(abs(start[0] - gr) + abs(start[1] - gc), s)]
+        pushes = heap_peak = 1
+        expanded = stale_pops = 0
+        while frontier:
+            _, u = heapq.heappop(frontier)
+            if u in closed:
+                stale_pops += 1
+                continue
+            closed.add(u)
+            expanded += 1
+            if u == t:
+                break
+            g = best_g[u]
+            for v, cost in neighbours(u):
+                new_g = g + cost
+                if v in closed or new_g >= best_g.get(v, new_g + 1):
+                    continue
+                best_g[v] = new_g
+                parent[v] = u
+                r, c = divmod(v, width)
+                heapq.heappush(frontier, (new_g + abs(r - gr) + abs(c - gc), v))
+                pushes += 1
+                heap_peak = max(heap_peak, len(frontier))
+        else:
+            return PathResult(False, [], -1, expanded, pushes, stale_pops, heap_peak)
+
+        hops = []
+        u = t
+        while u != -1:
+            hops.append(u)
+            u = parent[u]
+        hops.reverse()
+        path = self._refine(hops)
+        return PathResult(True, path, best_g[t], expanded, pushes, stale_pops, heap_peak)
+
+    def _refine(self, hops):
+        # Turn highway hops back into real squares
+        width = self.width
+        path = [divmod(hops[0], width)]
+        for a, b in zip(hops, hops[1:]):
+            if b in self._partners.get(a, ()):
+                path.append(divmod(b, width))
+                continue
+            cluster = self.cluster_of(divmod(a, width))
+            _, parent = self._cluster_bfs(cluster, a, want_parents=True)
+            leg = []
+            i = b
+            while i != a:
+                leg.append(divmod(i, width))
+                i = parent[i]
+            path.extend(reversed(leg))
+        return path
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+
+    from w2_compass_engine import solve_a_star
+
+    # Open water with a few long reefs (the kind of map where A* floods)
+    big = np.zeros((1024, 1024), dtype=np.uint8)
+    for row in range(100, 1024, 256):
+        big[row, 40:] = 1
+        big[row + 128, :-40] = 1
+
+    t0 = time.time()
+    hpa = HierarchicalGrid(big, cluster_size=32)
+    print(f"Highway map built in {time.time() - t0:.2f}s")
+
+    for solver, label in ((lambda: solve_a_star((1023, 1023), (0, 1023), big), "A*  "),
+                          (lambda: hpa.find_path((1023, 1023), (0, 1023)), "HPA*")):
+        t0 = time.time()
+        result = solver()
+        print(f"{label}: length={result.length} expanded={result.expanded} "
+              f"in {time.time() - t0:.3f}s")
+
+    t0 = time.time()
+    rebuilt = hpa.set_cell((99, 500), 1)
+    print(f"Wall at (99, 500): rebuilt clusters {sorted(rebuilt)} in {time.time() - t0:.4f}s")
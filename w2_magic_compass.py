@@ -48,7 +48,7 @@ def get_distance(pos, goal):
     return abs(pos[0] - goal[0]) + abs(pos[1] - goal[1])
 
 # 3. THE MAGIC COMPASS (A* Algorithm)
-def solve_a_star(start, end):
+def solve_a_star(start, end, grid=grid):
     """
     A* Algorithm: The "Magic Compass" that finds the shortest path
     --------------------------------------------------------------
@@ -65,7 +65,13 @@ def solve_a_star(start, end):
     const frontier = new PriorityQueue();
     frontier.enqueue({f: 0, pos: start, g: 0}, 0);
     ```
+
+    Got a monster map on disk? Pass it as `grid` - any list-of-lists or NumPy
+    array works, including a memory-mapped one from `w1_maze_engine.open_maze`
+    (there the exit is a 9, so we also stop when we reach `end`).
     """
+    rows, cols = len(grid), len(grid[0])  # How big is the ocean?
+
     # Frontier stores (VibeScore, current_pos, work_done)
     # Think of this like a surf lineup where the best waves (lowest F score) go first
     frontier = [(0, start, 0)]  # (F, position, G)
@@ -84,7 +90,7 @@ def solve_a_star(start, end):
         print(f"Checking {current} | Work Done: {g} | Compass says: {f-g} left")
 
         # If we found the exit (the perfect barrel), we're STOKED!
-        if grid[current[0]][current[1]] == 'E':
+        if current == end or grid[current[0]][current[1]] == 'E':
             print("Woo-hoo! 🎉 Found the shortest path with A*!")
             return True
 
@@ -93,7 +99,7 @@ def solve_a_star(start, end):
             nx, ny = current[0] + dx, current[1] + dy
 
             # Make sure we're still in the water (not on land or out of bounds)
-            if 0 <= nx < 5 and 0 <= ny < 5 and grid[nx][ny] != 1:
+            if 0 <= nx < rows and 0 <= ny < cols and grid[nx][ny] != 1:
                 # Calculate the new work done (G) and compass reading (H)
                 new_g = g + 1  # Each move costs 1 unit of work (like paddling)
                 h = get_distance((nx, ny), end)  # How far is the exit from here?
@@ -103,14 +109,15 @@ def solve_a_star(start, end):
     print("Bummer, dude! 😢 No path to the exit.")
     return False
 
-# 4. LET'S SHRED! (Run the algorithm)
-print("=== MAGIC COMPASS ACTIVATED ===")
-print("Finding the shortest path from 'S' to 'E'...\n")
-solve_a_star((0,0), (4,4))  # Start at (0,0), End at (4,4)
+if __name__ == "__main__":
+    # 4. LET'S SHRED! (Run the algorithm)
+    print("=== MAGIC COMPASS ACTIVATED ===")
+    print("Finding the shortest path from 'S' to 'E'...\n")
+    solve_a_star((0,0), (4,4))  # Start at (0,0), End at (4,4)
 
-# 5. THE EXPERIMENT (For curious grommets)
-print("\n=== THE EXPERIMENT ===")
-print("""
+    # 5. THE EXPERIMENT (For curious grommets)
+    print("\n=== THE EXPERIMENT ===")
+    print("""
 Try this, little grom:
 1. Change the walls (1s) to make a new maze
 2. Change the get_distance function to always return 0
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MONTE CARLO TREE SEARCH: The "Just Send It A Thousand Times" Player 🎲
+
+Minimax looks at EVERY move, every reply, every reply to the reply... On a
+Connect Four board that's more games than there are grains of sand at Bondi.
+MCTS doesn't even try. It plays out thousands of completely random games
+and keeps score:
+1. **Select**: walk down the tree, picking moves with UCT - mostly the ones
+   that have won a lot ("exploit"), sometimes ones we've barely tried
+   ("explore").
+2. **Expand**: at the edge of the tree, add the position's moves as new nodes.
+3. **Playout**: from there, both sides play random moves until someone wins.
+4. **Backprop**: walk back up, every node on the way gets a visit, and a
+   win if that result was good for the player who moved into it.
+Play the move that got visited the most. No evaluator, no depth - just
+"which move keeps winning when I try it heaps?"
+
+The tree isn't one Python object per node (that'd be millions of objects).
+It's a handful of NumPy arrays, and node i is just index i in all of them:
+visits[i], wins[i], first_child[i]... A node's children sit next to each
+other, so picking a child with UCT is one vectorised sum over a slice.
+
+And the tree is kept between moves: after we move and the opponent replies,
+the part of the tree under that new position is already half-searched.
+
+JS Analogy:
+```js
+// Struct-of-arrays instead of array-of-objects:
+const visits = new Float64Array(cap), wins = new Float64Array(cap);
+const firstChild = new Int32Array(cap).fill(-1);
+```
+"""
+
+# YOU NEED: pip install numpy
+import math
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from w3_mnk_engine import MNKGame
+from w3_tictactoe_engine import AI
+
+ONGOING = 2  # "Nobody's won yet" in the winner array (1 / -1 / 0 = result)
+
+# What `MCTSPlayer.search` hands back
+MCTSResult = namedtuple("MCTSResult",
+                        ["move", "visits", "win_rate", "iterations", "nodes", "reused", "elapsed"])
+
+
+class MCTSPlayer:
+    """
+    UCT Monte Carlo Tree Search for any `MNKGame` up to 64 squares.
+
+    Args:
+        game (MNKGame): The rules (default: plain 3x3 tic-tac-toe).
+        iterations (int): Playouts per move. If set, this wins over the clock.
+        time_budget (float): Seconds per move when `iterations` isn't set.
+        exploration (float): UCT's "c" - higher = try more unloved moves.
+        seed (int): Seed the random playouts (same seed + same iterations =
+            same moves, handy for testing).
+        capacity (int): Nodes to allocate up front (it grows by doubling).
+    """
+
+    def __init__(self, game=None, iterations=None, time_budget=1.0, exploration=1.4,
+                 seed=None, capacity=1 << 16):
+        self.game = game or MNKGame(3, 3, 3)
+        if self.game.size > 64:
+            raise ValueError("MCTSPlayer stores boards in uint64, so 64 squares max")
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self._rng = random.Random(seed)
+        self._alloc(capacity)
+        self._root = -1
+
+    # --- Node storage -------------------------------------------------------
+
+    def _alloc(self, capacity):
+        self._capacity = capacity
+        self._size = 0
+        self._ai = np.zeros(capacity, dtype=np.uint64)        # Board after the move
+        self._human = np.zeros(capacity, dtype=np.uint64)
+        self._mover = np.zeros(capacity, dtype=np.int8)       # Who moved INTO this node
+        self._winner = np.zeros(capacity, dtype=np.int8)      # ONGOING or the result
+        self._move = np.zeros(capacity, dtype=np.int16)
+        self._parent = np.zeros(capacity, dtype=np.int32)
+        self._first_child = np.zeros(capacity, dtype=np.int32)  # -1 = not expanded
+        self._num_children = np.zeros(capacity, dtype=np.int16)
+        self._visits = np.zeros(capacity, dtype=np.float64)
+        self._wins = np.zeros(capacity, dtype=np.float64)     # For the mover (draw = 0.5)
+
+    _ARRAYS = ("_ai", "_human", "_mover", "_winner", "_move", "_parent",
+               "_first_child", "_num_children", "_visits", "_wins")
+
+    def _grow(self, needed):
+        # Double until `needed` more nodes fit (like a JS array, but explicit)
+        capacity = self._capacity
+        while self._size + needed > capacity:
+            capacity *= 2
+        if capacity != self._capacity:
+            for name in self._ARRAYS:
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:self._size] = old[:self._size]
+                setattr(self, name, new)
+            self._capacity = capacity
+
+    def _new_root(self, ai, human, player):
+        self._size = 0
+        self._grow(1)
+        self._size = 1
+        self._ai[0], self._human[0] = ai, human
+        self._mover[0] = -player  # The root was "reached" by the other player
+        self._winner[0] = ONGOING
+        self._move[0] = -1
+        self._parent[0] = -1
+        self._first_child[0] = -1
+        self._num_children[0] = 0
+        self._visits[0] = self._wins[0] = 0
+        self._root = 0
+
+    def _compact(self, root):
+        # Keep only `root`'s subtree, renumbered from 0 (children stay together)
+        first_child, num_children = self._first_child, self._num_children
+        order = [root]
+        new_first = []
+        i = 0
+        while i < len(order):
+            c = int(first_child[order[i]])
+            if c >= 0:
+                new_first.append(len(order))
+                order.extend(range(c, c + int(num_children[order[i]])))
+            else:
+                new_first.append(-1)
+            i += 1
+        keep = np.array(order, dtype=np.int64)
+        renumber = np.full(self._size, -1, dtype=np.int32)
+        renumber[keep] = np.arange(len(keep), dtype=np.int32)
+
+        parents = self._parent[keep]
+        for name in self._ARRAYS:
+            arr = getattr(self, name)
+            arr[:len(keep)] = arr[keep]
+        self._parent[:len(keep)] = np.where(parents >= 0, renumber[np.maximum(parents, 0)], -1)
+        self._parent[0] = -1
+        self._first_child[:len(keep)] = new_first
+        self._size = len(keep)
+        self._root = 0
+
+    def _find(self, ai, human, player):
+        # Is (ai, human, player-to-move) the root or 1-2 plies below it?
+        if self._root < 0:
+            return -1
+        level = [self._root]
+        for _ in range(3):
+            below = []
+            for n in level:
+                if (int(self._ai[n]) == ai and int(self._human[n]) == human
+                        and self._mover[n] == -player):
+                    return n
+                c = int(self._first_child[n])
+                if c >= 0:
+                    below.extend(range(c, c + int(self._num_children[n])))
+            level = below
+        return -1
+
+    # --- The four steps -----------------------------------------------------
+
+    def _select(self, node):
+        # UCT over the children slice; untried children go first
+        c = int(self._first_child[node])
+        end = c + int(self._num_children[node])
+        visits = self._visits[c:end]
+        untried = np.flatnonzero(visits == 0)
+        if len(untried):
+            return c + int(untried[0])
+        ucb = self._wins[c:end] / visits + self.exploration * np.sqrt(
+            math.log(self._visits[node]) / visits)
+        return c + int(np.argmax(ucb))
+
+    def _expand(self, node):
+        game = self.game
+        ai, human = int(self._ai[node]), int(self._human[node])
+        player = -int(self._mover[node])
+        moves = game.legal_moves(ai, human)
+        self._grow(len(moves))
+        start = self._size
+        end = start + len(moves)
+        child_ai, child_human, winners = [], [], []
+        for sq in moves:
+            bit = 1 << sq
+            a, h = (ai | bit, human) if player == AI else (ai, human | bit)
+            if game.wins_with(a if player == AI else h, sq):
+                winners.append(player)
+            elif (a | h) == game.full:
+                winners.append(0)
+            else:
+                winners.append(ONGOING)
+            child_ai.append(a)
+            child_human.append(h)
+        self._ai[start:end] = child_ai
+        self._human[start:end] = child_human
+        self._mover[start:end] = player
+        self._winner[start:end] = winners
+        self._move[start:end] = moves
+        self._parent[start:end] = node
+        self._first_child[start:end] = -1
+        self._num_children[start:end] = 0
+        self._visits[start:end] = 0
+        self._wins[start:end] = 0
+        self._first_child[node] = start
+        self._num_children[node] = len(moves)
+        self._size = end
+
+    def _playout(self, node):
+        # Random moves on plain int bitboards until the game ends
+        game, rng = self.game, self._rng
+        ai, human = int(self._ai[node]), int(self._human[node])
+        player = -int(self._mover[node])
+        if not game.gravity:
+            occupied = ai | human
+            empties = [sq for sq in range(game.size) if not occupied >> sq & 1]
+            rng.shuffle(empties)
+            for sq in empties:
+                if player == AI:
+                    ai |= 1 << sq
+                    if game.wins_with(ai, sq):
+                        return AI
+                else:
+                    human |= 1 << sq
+                    if game.wins_with(human, sq):
+                        return -AI
+                player = -player
+            return 0
+        while True:
+            moves = game.legal_moves(ai, human)
+            if not moves:
+                return 0
+            sq = rng.choice(moves)
+            if player == AI:
+                ai |= 1 << sq
+                if game.wins_with(ai, sq):
+                    return AI
+            else:
+                human |= 1 << sq
+                if game.wins_with(human, sq):
+                    return -AI
+            player = -player
+
+    def _backprop(self, node, result):
+        visits, wins, mover, parent = self._visits, self._wins, self._mover, self._parent
+        while node >= 0:
+            visits[node] += 1
+            if result == 0:
+                wins[node] += 0.5
+            elif result == mover[node]:
+                wins[node] += 1
+            node = parent[node]
+
+    # --- Public API -----------------------------------------------------------
+
+    def search(self, ai, human, player=AI):
+        """
+        Think about the position (two bitboards) and pick a move for `player`.
+
+        Returns:
+            MCTSResult(move, visits, win_rate, iterations, nodes, reused, elapsed)
+            - `win_rate` is the chosen move's score for `player` (draw = 0.5),
+            `reused` is how many nodes were already there from last move.
+        """
+        started = time.perf_counter()
+        if not self.game.legal_moves(ai, human):
+            raise ValueError("No legal moves left, the game is over")
+        if self.game.winner(ai, human) is not None:
+            raise ValueError("The game is already over")
+
+        found = self._find(ai, human, player)
+        if found >= 0:
+            self._compact(found)
+        else:
+            self._new_root(ai, human, player)
+        reused = self._size - 1
+
+        root = self._root
+        deadline = started + self.time_budget
+        iterations = 0
+        winner, first_child = self._winner, self._first_child
+        while True:
+            if self.iterations is not None:
+                if iterations >= self.iterations:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+            node = root
+            while first_child[node] >= 0:
+                node = self._select(node)
+            if winner[node] == ONGOING:
+                self._expand(node)
+                winner, first_child = self._winner, self._first_child  # May have grown
+                node = self._select(node)
+                result = self._playout(node) if winner[node] == ONGOING else int(winner[node])
+            else:
+                result = int(winner[node])
+            self._backprop(node, result)
+            iterations += 1
+
+        c = int(self._first_child[root])
+        if c < 0:  # Not even one iteration - just play the first legal move
+            move, visits, win_rate = self.game.legal_moves(ai, human)[0], 0, 0.5
+        else:
+            end = c + int(self._num_children[root])
+            best = c + int(np.argmax(self._visits[c:end]))  # Most visited = most trusted
+            move = int(self._move[best])
+            visits = int(self._visits[best])
+            win_rate = float(self._wins[best] / visits) if visits else 0.5
+        return MCTSResult(move, visits, win_rate, iterations, self._size, reused,
+                          time.perf_counter() - started)
+
+    def best_move(self, b, player=AI):
+        """`get_best_move`-style: a flat list board (1 / -1 / 0) in, a square out."""
+        ai, human = self.game.from_list(b)
+        return self.search(ai, human, player).move
+
+
+def get_best_move(b, engine=None):
+    """
+    Drop-in for `w3_tictactoe.get_best_move` (3x3 list board, AI = 1).
+
+    Pass the same `MCTSPlayer` as `engine` every turn to keep (and reuse)
+    its tree - same name as in `w3_tictactoe_engine` / `w3_mnk_engine`.
+    """
+    engine = engine or MCTSPlayer(iterations=5000)
+    return engine.best_move(b, AI)
+
+
+if __name__ == "__main__":
+    # Tic-tac-toe: the AI should still find the obvious stuff
+    player = MCTSPlayer(iterations=5000, seed=1)
+    print(f"3x3 opening: {get_best_move([0] * 9, engine=player)} (centre is 4)")
+    print(f"3x3 win-in-1: {get_best_move([1, 1, 0, -1, -1, 0, 0, 0, 0], engine=player)} (should be 2)")
+    print(f"3x3 must-block: {get_best_move([-1, -1, 0, 0, 1, 0, 0, 0, 0], engine=player)} (should be 2)")
+
+    # Connect Four, one second per move, the tree carried between moves
+    game = MNKGame(6, 7, 4, gravity=True)
+    player = MCTSPlayer(game, time_budget=1.0, seed=7)
+    ai = human = 0
+    for turn in range(3):
+        result = player.search(ai, human, AI)
+        print(f"Connect Four turn {turn + 1}: column {result.move % game.cols} | "
+              f"{result.iterations} playouts, win rate {result.win_rate:.2f}, "
+              f"{result.nodes} nodes ({result.reused} reused) in {result.elapsed:.2f}s")
+        ai |= 1 << result.move
+        reply = game.legal_moves(ai, human)[0]  # The human always plays the middle-most column
+        human |= 1 << reply
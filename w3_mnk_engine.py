@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+M,N,K ENGINE: Tic-Tac-Toe's Big Brothers 🏟️
+
+Tic-tac-toe is an "m,n,k game": an m x n board, first to get k in a row wins
+(3,3,3). Crank the numbers up and you get way gnarlier games:
+- 4,4,4  (4x4, four in a row)
+- 5,5,4  (5x5, four in a row)
+- 6,7,4 with GRAVITY = Connect Four (pieces drop to the lowest empty row)
+
+On those boards you can NOT search to the end of the game - the tree is
+astronomically huge. So this engine plays like a human with a chess clock:
+- **Iterative deepening**: search 1 move ahead, then 2, then 3... and keep
+  the best move from the deepest search that FINISHED. When the clock runs
+  out mid-search, we just hand back that move. You always get an answer.
+- **Heuristic evaluator**: when we stop before the game ends, we need to
+  guess who's winning. The default counts "open lines" (rows of k squares
+  that only one player has pieces in - more pieces = scarier). Plug in your
+  own with `evaluator=`.
+- **Alpha-beta + transposition table + history ordering**, same tricks as
+  `w3_tictactoe_engine`, and the previous iteration's best move goes first
+  (which is what makes iterative deepening almost free).
+
+Boards are bitboards like `w3_tictactoe_engine.Bitboard`: one integer per
+player, bit (row * cols + col) per square, row 0 at the top.
+
+JS Analogy:
+```js
+// Iterative deepening = "give me your best answer so far" with a timeout:
+let best;
+for (let depth = 1; performance.now() < deadline; depth++) best = search(depth);
+return best;
+```
+"""
+
+import math
+import time
+from collections import namedtuple
+
+from w3_tictactoe_engine import AI, EXACT, HUMAN, LOWER, UPPER, SearchStats, TranspositionTable
+
+# A win is worth this much, minus the plies it takes (win sooner = better).
+# Heuristic scores must stay well below WIN_SCORE - MAX_PLY.
+WIN_SCORE = 1_000_000
+MAX_PLY = 1000
+
+# How often (in nodes) we look at the clock
+CLOCK_EVERY = 256
+
+# What `MNKEngine.search` hands back
+MoveResult = namedtuple("MoveResult", ["move", "score", "depth", "nodes", "elapsed", "complete"])
+
+
+class OutOfTime(Exception):
+    """The clock ran out mid-search (caught inside the engine, never escapes)."""
+
+
+class MNKGame:
+    """
+    The rules of one m,n,k game: board size, k in a row, gravity or not.
+
+    Everything expensive (the winning lines through each square, the order
+    to try moves in) is worked out once here, not during the search.
+    """
+
+    def __init__(self, rows, cols, k, gravity=False):
+        if k > max(rows, cols):
+            raise ValueError(f"Can't get {k} in a row on a {rows}x{cols} board")
+        self.rows, self.cols, self.k = rows, cols, k
+        self.gravity = gravity
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+
+        # Every k-in-a-row "window" as a bitmask
+        windows = []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        windows.append(sum(1 << ((r + dr * i) * cols + c + dc * i)
+                                           for i in range(k)))
+        self.windows = tuple(windows)
+        # Only the windows through the square just played can have been completed
+        self.windows_through = tuple(
+            tuple(w for w in windows if w >> square & 1) for square in range(self.size)
+        )
+
+        # Static move order: squares closest to the centre first
+        mid_r, mid_c = (rows - 1) / 2, (cols - 1) / 2
+        self.centre_order = tuple(sorted(
+            range(self.size),
+            key=lambda sq: abs(sq // cols - mid_r) + abs(sq % cols - mid_c),
+        ))
+        # For gravity: each column's squares, bottom row first; columns centre-first
+        self.column_order = tuple(sorted(range(cols), key=lambda c: abs(c - mid_c)))
+        self.columns = tuple(
+            tuple((r * cols + c) for r in range(rows - 1, -1, -1)) for c in range(cols)
+        )
+
+    def from_list(self, b):
+        """(ai, human) masks from a flat list (1 = AI, -1 = Human, 0 = Empty)."""
+        if len(b) != self.size:
+            raise ValueError(f"Board has {len(b)} squares, expected {self.size}")
+        ai = human = 0
+        for i, v in enumerate(b):
+            if v == AI:
+                ai |= 1 << i
+            elif v == HUMAN:
+                human |= 1 << i
+        return ai, human
+
+    def legal_moves(self, ai, human):
+        """Squares you can play, in a good-moves-first static order."""
+        occupied = ai | human
+        if not self.gravity:
+            return [sq for sq in self.centre_order if not occupied >> sq & 1]
+        moves = []
+        for c in self.column_order:
+            for sq in self.columns[c]:
+                if not occupied >> sq & 1:
+                    moves.append(sq)  # The lowest empty square in this column
+                    break
+        return moves
+
+    def wins_with(self, mask, square):
+        """Did the move on `square` complete a k-in-a-row for `mask`?"""
+        for w in self.windows_through[square]:
+            if mask & w == w:
+                return True
+        return False
+
+    def winner(self, ai, human):
+        """1, -1, 0 (board full) or None, checking every window (slow, for callers)."""
+        for w in self.windows:
+            if ai & w == w:
+                return AI
+            if human & w == w:
+                return HUMAN
+        return 0 if (ai | human) == self.full else None
+
+
+def line_potential(game, ai, human):
+    """
+    The default "who's winning?" guess, from the AI's point of view.
+
+    Every window (k squares in a line) that only ONE player has pieces in is
+    still "alive" for them. More pieces in it = closer to a win, and that
+    counts for a LOT more (10x per piece). Windows with both players in them
+    are dead and count for nothing.
+    """
+    score = 0
+    for w in game.windows:
+        a = ai & w
+        h = human & w
+        if a and not h:
+            score += 10 ** (bin(a).count("1") - 1)
+        elif h and not a:
+            score -= 10 ** (bin(h).count("1") - 1)
+    return score
+
+
+class MNKEngine:
+    """
+    Iterative-deepening alpha-beta for any `MNKGame`, on a per-move time budget.
+
+    Args:
+        game (MNKGame): The rules.
+        evaluator: `evaluator(game, ai, human) -> score` for positions where
+            we stop before the game ends (AI's point of view, bigger = better
+            for the AI). Defaults to `line_potential`.
+        tt_capacity (int): Max positions to remember (oldest get evicted).
+    """
+
+    def __init__(self, game, evaluator=None, tt_capacity=1 << 20):
+        self.game = game
+        self.evaluator = evaluator or line_potential
+        self.tt = TranspositionTable(tt_capacity)
+        self.history = {AI: [0] * game.size, HUMAN: [0] * game.size}
+        self.stats = SearchStats()
+        self._deadline = math.inf
+
+    # Win scores depend on how far from the ROOT they are, but the table is
+    # shared across positions and searches, so store them relative to the node.
+    @staticmethod
+    def _to_tt(score, ply):
+        if score > WIN_SCORE - MAX_PLY:
+            return score + ply
+        if score < -WIN_SCORE + MAX_PLY:
+            return score - ply
+        return score
+
+    @staticmethod
+    def _from_tt(score, ply):
+        if score > WIN_SCORE - MAX_PLY:
+            return score - ply
+        if score < -WIN_SCORE + MAX_PLY:
+            return score + ply
+        return score
+
+    def _ordered(self, ai, human, player, first):
+        moves = self.game.legal_moves(ai, human)
+        history = self.history[player]
+        return sorted(moves, key=lambda m: (m != first, -history[m]))
+
+    def alphabeta(self, ai, human, depth, ply, alpha, beta, is_maximizing):
+        """
+        Score of the position with `depth` plies left to search.
+
+        The side that just moved can't have been checked for a win yet by the
+        caller - that happens in the loop below, right after each move.
+        """
+        stats = self.stats
+        stats.nodes += 1
+        if stats.nodes % CLOCK_EVERY == 0 and time.perf_counter() > self._deadline:
+            raise OutOfTime
+        if (ai | human) == self.game.full:
+            return 0  # Board full, nobody won: tie
+        if depth == 0:
+            return self.evaluator(self.game, ai, human)
+
+        key = (ai, human, is_maximizing)
+        first = -1
+        entry = self.tt.get(key)
+        if entry is not None:
+            score, bound, stored_depth, move = entry
+            first = move
+            if stored_depth >= depth:
+                score = self._from_tt(score, ply)
+                if bound == EXACT:
+                    return score
+                if bound == LOWER and score > alpha:
+                    alpha = score
+                elif bound == UPPER and score < beta:
+                    beta = score
+                if alpha >= beta:
+                    return score
+        alpha_start, beta_start = alpha, beta
+
+        game = self.game
+        player = AI if is_maximizing else HUMAN
+        best_score = -math.inf if is_maximizing else math.inf
+        best_move = -1
+        for sq in self._ordered(ai, human, player, first):
+            bit = 1 << sq
+            if is_maximizing:
+                if game.wins_with(ai | bit, sq):
+                    score = WIN_SCORE - ply - 1
+                else:
+                    score = self.alphabeta(ai | bit, human, depth - 1, ply + 1, alpha, beta, False)
+                if score > best_score:
+                    best_score, best_move = score, sq
+                if best_score > alpha:
+                    alpha = best_score
+            else:
+                if game.wins_with(human | bit, sq):
+                    score = -WIN_SCORE + ply + 1
+                else:
+                    score = self.alphabeta(ai, human | bit, depth - 1, ply + 1, alpha, beta, True)
+                if score < best_score:
+                    best_score, best_move = score, sq
+                if best_score < beta:
+                    beta = best_score
+            if alpha >= beta:
+                stats.cutoffs += 1
+                self.history[player][sq] += depth * depth
+                break
+
+        if best_score <= alpha_start:
+            bound = UPPER
+        elif best_score >= beta_start:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.put(key, self._to_tt(best_score, ply), bound, depth, best_move)
+        return best_score
+
+    def _root(self, ai, human, depth, player, first):
+        # One full-width pass at the root; returns (best_move, best_score)
+        game = self.game
+        maximizing = player == AI
+        best_move, best_score = -1, -math.inf if maximizing else math.inf
+        alpha, beta = -math.inf, math.inf
+        for sq in self._ordered(ai, human, player, first):
+            bit = 1 << sq
+            if maximizing:
+                if game.wins_with(ai | bit, sq):
+                    return sq, WIN_SCORE - 1
+                score = self.alphabeta(ai | bit, human, depth - 1, 1, alpha, beta, False)
+                if score > best_score:
+                    best_move, best_score = sq, score
+                    alpha = max(alpha, score)
+            else:
+                if game.wins_with(human | bit, sq):
+                    return sq, -WIN_SCORE + 1
+                score = self.alphabeta(ai, human | bit, depth - 1, 1, alpha, beta, True)
+                if score < best_score:
+                    best_move, best_score = sq, score
+                    beta = min(beta, score)
+        return best_move, best_score
+
+    def search_depth(self, ai, human, player=AI, depth=4):
+        """
+        One fixed-depth search, no clock (so the answer never depends on timing).
+
+        Returns:
+            MoveResult like `search`, with `depth` = the depth asked for.
+        """
+        started = time.perf_counter()
+        self._deadline = math.inf
+        self.stats = SearchStats()
+        if not self.game.legal_moves(ai, human):
+            raise ValueError("No legal moves left, the game is over")
+        empties = self.game.size - bin(ai | human).count("1")
+        depth = min(depth, empties)
+        move, score = self._root(ai, human, depth, player, -1)
+        return MoveResult(move, score, depth, self.stats.nodes, time.perf_counter() - started,
+                          depth == empties or abs(score) > WIN_SCORE - MAX_PLY)
+
+    def search(self, ai, human, player=AI, time_budget=1.0, max_depth=None):
+        """
+        Best move for `player`, searching deeper and deeper until time's up.
+
+        Args:
+            ai, human (int): The two bitboards.
+            player: AI (1) or HUMAN (-1) - whose move it is.
+            time_budget (float): Seconds we're allowed to think (a hard cap:
+                the clock is checked every few hundred nodes).
+            max_depth (int): Stop deepening here (default: squares left).
+
+        Returns:
+            MoveResult(move, score, depth, nodes, elapsed, complete) - `depth`
+            is the deepest FINISHED search, `complete` is True if that search
+            reached the end of the game (so the score is exact, not a guess).
+        """
+        started = time.perf_counter()
+        self._deadline = started + time_budget
+        self.stats = SearchStats()
+
+        moves = self.game.legal_moves(ai, human)
+        if not moves:
+            raise ValueError("No legal moves left, the game is over")
+        empties = self.game.size - bin(ai | human).count("1")
+        max_depth = min(max_depth or empties, empties)
+
+        best_move, best_score, finished = moves[0], 0, 0
+        try:
+            for depth in range(1, max_depth + 1):
+                move, score = self._root(ai, human, depth, player, best_move)
+                best_move, best_score, finished = move, score, depth
+                if abs(score) > WIN_SCORE - MAX_PLY:
+                    break  # Forced win/loss found, deeper won't change it
+        except OutOfTime:
+            pass
+
+        return MoveResult(
+            best_move, best_score, finished, self.stats.nodes,
+            time.perf_counter() - started,
+            finished == empties or abs(best_score) > WIN_SCORE - MAX_PLY,
+        )
+
+
+def get_best_move(game, b, player=AI, time_budget=1.0, engine=None):
+    """
+    `w3_tictactoe.get_best_move`, for any m,n,k board (a flat list of 1/-1/0).
+
+    Pass the same `engine` every turn to keep its transposition table warm.
+    """
+    engine = engine or MNKEngine(game)
+    ai, human = game.from_list(b)
+    return engine.search(ai, human, player, time_budget).move
+
+
+if __name__ == "__main__":
+    for label, game in (
+        ("3x3, 3 in a row (tic-tac-toe)", MNKGame(3, 3, 3)),
+        ("4x4, 4 in a row", MNKGame(4, 4, 4)),
+        ("5x5, 4 in a row", MNKGame(5, 5, 4)),
+        ("Connect Four (6x7, 4, gravity)", MNKGame(6, 7, 4, gravity=True)),
+    ):
+        engine = MNKEngine(game)
+        result = engine.search(0, 0, AI, time_budget=1.0)
+        r, c = divmod(result.move, game.cols)
+        print(f"{label}: plays ({r}, {c}) | depth {result.depth} | "
+              f"score {result.score} | {result.nodes} nodes in {result.elapsed:.2f}s"
+              f"{' (solved!)' if result.complete else ''}")
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PARALLEL ROOT SEARCH: The "Everyone Scouts A Different Peak" Crew 🏄‍♂️🏄‍♀️
+
+At the root of the game tree, every move is its own separate subtree - on a
+5x5 or Connect Four board each one is a big chunk of work, and they don't
+need each other. So hand them out to a crew of worker processes.
+
+The catch: alpha-beta gets its speed from "I already found a move worth X, so
+stop looking at anything worse". Searched separately, every worker would
+start from zero and prune nothing. So:
+- **Young Brothers Wait**: the FIRST move (the "eldest brother", usually the
+  best one) is searched on its own first. Its score becomes the bar.
+- **Shared alpha**: the best score so far lives in shared memory. Every
+  worker reads it before starting a move (and raises it when it beats it),
+  so later moves get pruned against the best score found by ANYONE.
+- **Deterministic**: a move that can't beat the bar is cut off one point
+  BELOW it, so ties are never lost. The winner is then picked exactly like
+  the serial search does (best score, earliest move in the static order).
+  Same move and score as `MNKEngine(game).search_depth(...)`, whatever order
+  the workers finish in.
+
+JS Analogy:
+```js
+// Like workers sharing the best-so-far in a SharedArrayBuffer:
+const best = new Int32Array(new SharedArrayBuffer(4));
+if (score > Atomics.load(best, 0)) Atomics.store(best, 0, score);
+```
+"""
+
+import itertools
+import math
+import os
+import time
+from multiprocessing import Pool, Value
+
+from w3_mnk_engine import MAX_PLY, WIN_SCORE, MNKEngine, MoveResult
+from w3_tictactoe_engine import AI
+
+# "Nobody has a score yet" in the shared slot (it's a C long long)
+NO_BOUND = -(2 ** 62)
+
+# Each worker process keeps these after `_attach` runs (one per process)
+_worker_engine = None
+_worker_bound = None
+_worker_search = None
+
+# Every search (by any ParallelSearch in this process) gets its own number
+_search_ids = itertools.count(1)
+
+
+def _attach(game, evaluator, tt_capacity, bound):
+    # Pool initializer: one engine (and transposition table) per worker
+    global _worker_engine, _worker_bound
+    _worker_engine = MNKEngine(game, evaluator, tt_capacity)
+    _worker_bound = bound
+
+
+def _search_move(job):
+    # Score one root move against the shared bar. The bar is stored from the
+    # mover's point of view (bigger = better for whoever is moving).
+    global _worker_search
+    search_id, index, move, ai, human, player, depth = job
+    engine, bound = _worker_engine, _worker_bound
+    if search_id != _worker_search:
+        # New search: forget the old table. A DEEPER score remembered from
+        # the last move would be "better" but not what a fixed-depth serial
+        # search returns. (Within one search every position is always the
+        # same depth from the root, so the table is safe to share.)
+        engine.tt.clear()
+        _worker_search = search_id
+    game = engine.game
+    maximizing = player == AI
+    nodes_before = engine.stats.nodes
+    bit = 1 << move
+
+    bar = bound.value
+    if maximizing:
+        if game.wins_with(ai | bit, move):
+            score = WIN_SCORE - 1
+        else:
+            alpha = bar - 1 if bar != NO_BOUND else -math.inf
+            score = engine.alphabeta(ai | bit, human, depth - 1, 1, alpha, math.inf, False)
+        mine = score
+    else:
+        if game.wins_with(human | bit, move):
+            score = -WIN_SCORE + 1
+        else:
+            beta = -(bar - 1) if bar != NO_BOUND else math.inf
+            score = engine.alphabeta(ai, human | bit, depth - 1, 1, -math.inf, beta, True)
+        mine = -score
+
+    # Cut off one point below the bar = "definitely worse than the best".
+    # Anything else is the exact score (the window is open on the other side).
+    exact = bar == NO_BOUND or mine > bar - 1
+    if exact:
+        with bound.get_lock():
+            if mine > bound.value:
+                bound.value = mine
+    return index, score, exact, engine.stats.nodes - nodes_before
+
+
+class ParallelSearch:
+    """
+    Fixed-depth alpha-beta for an `MNKGame`, split across processes at the root.
+
+    Keep one around (or use `with`) so the worker pool survives between
+    moves (starting processes isn't free).
+
+    Args:
+        game (MNKGame): The rules.
+        workers (int): How many processes (default: every CPU core).
+            `workers=1` runs in this process, no pool.
+        evaluator: Same as `MNKEngine` (must be a top-level function so the
+            workers can find it).
+        tt_capacity (int): Transposition table size PER worker.
+    """
+
+    def __init__(self, game, workers=None, evaluator=None, tt_capacity=1 << 18):
+        self.game = game
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._bound = Value("q", NO_BOUND)
+        self._engine = MNKEngine(game, evaluator, tt_capacity)  # The eldest brother's
+        self._pool = None
+        if self.workers > 1:
+            self._pool = Pool(self.workers, initializer=_attach,
+                              initargs=(game, evaluator, tt_capacity, self._bound))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, ai, human, player=AI, depth=4):
+        """
+        Best move for `player`, searching `depth` plies.
+
+        Returns:
+            MoveResult(move, score, depth, nodes, elapsed, complete) - move and
+            score are identical to the serial `MNKEngine.search_depth`; nodes
+            is the total over every process.
+        """
+        global _worker_engine, _worker_bound
+        started = time.perf_counter()
+        moves = self.game.legal_moves(ai, human)
+        if not moves:
+            raise ValueError("No legal moves left, the game is over")
+        empties = self.game.size - bin(ai | human).count("1")
+        depth = max(1, min(depth, empties))
+        maximizing = player == AI
+        self._bound.value = NO_BOUND
+        search_id = next(_search_ids)
+
+        jobs = [(search_id, index, move, ai, human, player, depth)
+                for index, move in enumerate(moves)]
+
+        # Young Brothers Wait: the eldest goes first, right here, to set the bar
+        _worker_engine, _worker_bound = self._engine, self._bound
+        try:
+            results = [_search_move(jobs[0])]
+            if self._pool is None:
+                results.extend(_search_move(job) for job in jobs[1:])
+        finally:
+            _worker_engine = _worker_bound = None
+        if self._pool is not None and len(jobs) > 1:
+            results.extend(self._pool.imap_unordered(_search_move, jobs[1:]))
+
+        # Same pick as the serial root loop: best exact score, earliest move wins ties
+        best_index, best_score = -1, None
+        for index, score, exact, _ in sorted(results):
+            if not exact:
+                continue
+            if best_score is None or (score > best_score if maximizing else score < best_score):
+                best_index, best_score = index, score
+        nodes = sum(r[3] for r in results)
+        return MoveResult(moves[best_index], best_score, depth, nodes,
+                          time.perf_counter() - started,
+                          depth == empties or abs(best_score) > WIN_SCORE - MAX_PLY)
+
+
+if __name__ == "__main__":
+    from w3_mnk_engine import MNKGame
+
+    game = MNKGame(6, 7, 4, gravity=True)  # Connect Four
+    board = [0] * 42
+    for square, who in ((38, 1), (37, -1), (31, 1), (39, -1)):
+        board[square] = who
+    ai, human = game.from_list(board)
+
+    serial = MNKEngine(game).search_depth(ai, human, AI, depth=8)
+    print(f"Serial:          plays {serial.move} score {serial.score} | "
+          f"{serial.nodes} nodes in {serial.elapsed:.2f}s")
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        with ParallelSearch(game, workers=workers) as crew:
+            result = crew.search(ai, human, AI, depth=8)
+        same = (result.move, result.score) == (serial.move, serial.score)
+        print(f"{workers} worker(s):     plays {result.move} score {result.score} | "
+              f"{result.nodes} nodes in {result.elapsed:.2f}s "
+              f"({serial.elapsed / result.elapsed:.1f}x) {'✅ same' if same else '❌ DIFFERENT'}")
@@ -103,22 +103,6 @@ def get_best_move(b):
                 move = i
     return move  # Return the best move (0-8)
 
-# 5. TEST THE AI (The "Shred Session")
-print("AI is thinking... calculating every outcome...")
-m = get_best_move(board)  # AI picks the best move
-print(f"AI plays at position: {m}")  # Print the move (should be 4, the center)
-
-# 6. PLAY AGAINST THE AI (The "Boss Battle")
-# Now you can play against the AI! It's like challenging your little bro,
-# but this time, he's **unbeatable**.
-#
-# How to play:
-# - Input a number (0-8) to place your move.
-# - The AI will respond with its move.
-# - Try to beat it... if you can. (Spoiler: You can't. It's **cooked**.)
-
-print("\nLet's play! You're -1, AI is 1. Enter a number (0-8) to make your move:")
-
 # Print the board (for reference)
 def print_board(b):
     print("\nCurrent board:")
@@ -127,49 +111,72 @@ def print_board(b):
         if i < 2:
             print("-----------")
 
-print_board(board)
+if __name__ == "__main__":
+    # 5. TEST THE AI (The "Shred Session")
+    print("AI is thinking... calculating every outcome...")
+    m = get_best_move(board)  # AI picks the best move
+    print(f"AI plays at position: {m}")  # Print the move (should be 4, the center)
+
+    # 6. PLAY AGAINST THE AI (The "Boss Battle")
+    # Now you can play against the AI! It's like challenging your little bro,
+    # but this time, he's **unbeatable**.
+    #
+    # How to play:
+    # - Input a number (0-8) to place your move.
+    # - The AI will respond with its move.
+    # - Try to beat it... if you can. (Spoiler: You can't. It's **cooked**.)
+
+    print("\nLet's play! You're -1, AI is 1. Enter a number (0-8) to make your move:")
+
+    # The AI's answer key (see w3_tictactoe_table.py). It only gets opened on
+    # the AI's first turn, and every move after that is one lookup. No table
+    # file yet? It quietly falls back to searching.
+    from w3_tictactoe_table import SolvedTable
+    table = SolvedTable()
 
-# Game loop (the "Boss Battle")
-while True:
-    # Human's turn
-    try:
-        human_move = int(input("Your move (0-8): "))
-        if board[human_move] != 0:
-            print("Bogus move, brah! That spot's already taken.")
-            continue
-        board[human_move] = -1  # Human takes the spot
-    except (ValueError, IndexError):
-        print("Bogus input, brah! Enter a number between 0 and 8.")
-        continue
-
-    # Check if human won
-    if check_win(board) == -1:
-        print_board(board)
-        print("You win! ...Wait, how? Did you cheat?")
-        break
-    elif check_win(board) == 0:
-        print_board(board)
-        print("Tie! You're lucky, brah.")
-        break
+    print_board(board)
 
-    # AI's turn
-    print("AI is thinking...")
-    ai_move = get_best_move(board)
-    board[ai_move] = 1  # AI takes the spot
-    print(f"AI plays at position: {ai_move}")
+    # Game loop (the "Boss Battle")
+    while True:
+        # Human's turn
+        try:
+            human_move = int(input("Your move (0-8): "))
+            if board[human_move] != 0:
+                print("Bogus move, brah! That spot's already taken.")
+                continue
+            board[human_move] = -1  # Human takes the spot
+        except (ValueError, IndexError):
+            print("Bogus input, brah! Enter a number between 0 and 8.")
+            continue
 
-    # Check if AI won
-    if check_win(board) == 1:
+        # Check if human won
+        if check_win(board) == -1:
+            print_board(board)
+            print("You win! ...Wait, how? Did you cheat?")
+            break
+        elif check_win(board) == 0:
+            print_board(board)
+            print("Tie! You're lucky, brah.")
+            break
+
+        # AI's turn
+        print("AI is thinking...")
+        ai_move = table.best_move(board)
+        board[ai_move] = 1  # AI takes the spot
+        print(f"AI plays at position: {ai_move}")
+
+        # Check if AI won
+        if check_win(board) == 1:
+            print_board(board)
+            print("AI wins! Told you it's **cooked**.")
+            break
+        elif check_win(board) == 0:
+            print_board(board)
+            print("Tie! You got lucky, brah.")
+            break
+
+        # Print the board after each move
         print_board(board)
-        print("AI wins! Told you it's **cooked**.")
-        break
-    elif check_win(board) == 0:
-        print_board(board)
-        print("Tie! You got lucky, brah.")
-        break
-
-    # Print the board after each move
-    print_board(board)
 
 # 7. THE ROAST (The "Final Verdict")
 # If you somehow beat this AI, your minimax logic is **bogus**.
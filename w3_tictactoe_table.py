@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SOLVED TABLE: Tic-Tac-Toe's Answer Key 📒
+
+Here's the thing: 3x3 tic-tac-toe only has a few thousand boards you can
+actually reach in a real game, and once you fold away rotations and flips
+it's well under a thousand. So why is the AI thinking at ALL?
+
+This module does the homework ONCE, offline:
+1. Walk every reachable board (either player can go first).
+2. Solve each one (rotations/flips share one answer) with `w3_tictactoe_engine`.
+3. Write the answers - best move + score, keyed by the canonical board - to a
+   tiny binary file (under 8 KB).
+
+The game then memory-maps that file the first time it needs a move (so
+starting up costs nothing), and every AI move is one binary search in a
+sorted array. If the file is missing or the board isn't in it, we just fall
+back to the live search.
+
+Usage:
+```
+python w3_tictactoe_table.py          # builds w3_tictactoe.table next to this file
+```
+
+JS Analogy:
+```js
+// Precompute once at build time, then it's just a lookup at runtime:
+const answers = await fetch("/answers.bin").then(r => r.arrayBuffer());
+```
+"""
+
+# YOU NEED: pip install numpy
+import os
+import struct
+
+import numpy as np
+
+from w3_tictactoe_engine import AI, HUMAN, Bitboard, Engine
+
+TABLE_MAGIC = b"TTTB"
+TABLE_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")  # magic, version, reserved, record count
+HEADER_SIZE = _HEADER.size
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "w3_tictactoe.table")
+
+
+def _key(code, player):
+    # Same key as the engine's transposition table: canonical code + side to move
+    return code * 2 + (player == AI)
+
+
+def reachable_positions():
+    """
+    Every (canonical code, side to move) you can reach in a real game that
+    isn't over yet. Both "AI goes first" and "Human goes first" games count.
+    """
+    seen = set()
+    frontier = [(Bitboard(), AI), (Bitboard(), HUMAN)]
+    while frontier:
+        bb, player = frontier.pop()
+        if bb.winner() is not None:
+            continue  # Game over, nothing to look up
+        code, _ = bb.canonical()
+        if (code, player) in seen:
+            continue
+        seen.add((code, player))
+        empty = bb.empty()
+        for i in range(9):
+            if empty >> i & 1:
+                child = Bitboard(*bb.masks)
+                child.play(i, player)
+                frontier.append((child, -player))
+    return seen
+
+
+def build_table(path=DEFAULT_PATH):
+    """
+    Solve every reachable position and write the answer key to `path`.
+
+    File layout (all little-endian):
+        16-byte header  magic "TTTB", version, reserved, record count N
+        N x uint32      keys, sorted (canonical code * 2 + AI-to-move)
+        N x uint8       best move, in the CANONICAL orientation
+        N x int8        score from the AI's point of view (engine scale)
+
+    Returns:
+        The number of positions written.
+    """
+    records = []
+    for code, player in reachable_positions():
+        # Solve the canonical board itself, so the move is already canonical.
+        # A fresh engine each time = the same move a live search would pick.
+        board = Bitboard(code >> 9, code & 0x1FF).to_list()
+        move, score, _ = Engine().search(board, player)
+        records.append((_key(code, player), move, score))
+    records.sort()
+
+    keys = np.array([r[0] for r in records], dtype="<u4")
+    moves = np.array([r[1] for r in records], dtype=np.uint8)
+    scores = np.array([r[2] for r in records], dtype=np.int8)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, 0, len(records)))
+        f.write(keys.tobytes())
+        f.write(moves.tobytes())
+        f.write(scores.tobytes())
+    return len(records)
+
+
+class SolvedTable:
+    """
+    The answer key, opened lazily: nothing is read until the first lookup.
+
+    If the file doesn't exist, `lookup` just says "dunno" (None) and
+    `best_move` falls back to a live `Engine` search.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._keys = self._moves = self._scores = None
+        self._loaded = False
+        self._engine = None
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{self.path} is too small to be a solved table")
+        magic, version, _, n = _HEADER.unpack(header)
+        if magic != TABLE_MAGIC:
+            raise ValueError(f"{self.path} is not a solved table (bad magic {magic!r})")
+        if version != TABLE_VERSION:
+            raise ValueError(f"{self.path} is table format v{version}, we only speak v{TABLE_VERSION}")
+        expected = HEADER_SIZE + n * 6
+        actual = os.path.getsize(self.path)
+        if actual != expected:
+            raise ValueError(f"{self.path} is {actual} bytes, header says it should be {expected}")
+        if n == 0:
+            return
+        self._keys = np.memmap(self.path, dtype="<u4", mode="r", offset=HEADER_SIZE, shape=(n,))
+        self._moves = np.memmap(self.path, dtype=np.uint8, mode="r",
+                                offset=HEADER_SIZE + 4 * n, shape=(n,))
+        self._scores = np.memmap(self.path, dtype=np.int8, mode="r",
+                                 offset=HEADER_SIZE + 5 * n, shape=(n,))
+
+    def lookup(self, b, player=AI):
+        """
+        (move, score) for `player` on board `b` (a list or a Bitboard), or
+        None if the table doesn't have it (no file, game over, or a board
+        no real game can reach).
+        """
+        if not self._loaded:
+            self._load()
+        if self._keys is None:
+            self.misses += 1
+            return None
+        bb = b if isinstance(b, Bitboard) else Bitboard.from_list(b)
+        code, perm = bb.canonical()
+        key = _key(code, player)
+        i = int(np.searchsorted(self._keys, key))
+        if i == len(self._keys) or self._keys[i] != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return perm[self._moves[i]], int(self._scores[i])
+
+    def best_move(self, b, player=AI):
+        """The table's move if it has one, otherwise a live engine search."""
+        found = self.lookup(b, player)
+        if found is not None:
+            return found[0]
+        self._engine = self._engine or Engine()
+        move, _, _ = self._engine.search(b, player)
+        return move
+
+    def __repr__(self):
+        return f"SolvedTable({self.path!r}, hits={self.hits}, misses={self.misses})"
+
+
+if __name__ == "__main__":
+    import time
+
+    t0 = time.time()
+    n = build_table()
+    print(f"Solved {n} positions in {time.time() - t0:.2f}s -> {DEFAULT_PATH} "
+          f"({os.path.getsize(DEFAULT_PATH)} bytes)")
+
+    table = SolvedTable()
+    t0 = time.perf_counter()
+    move, score = table.lookup([0] * 9)
+    print(f"Opening move from the table: {move} (score {score}) "
+          f"in {(time.perf_counter() - t0) * 1e6:.0f}µs (includes opening the file)")
+    t0 = time.perf_counter()
+    move, score = table.lookup([1, 0, 0, 0, -1, 0, 0, 0, 0])
+    print(f"Turn 2: {move} (score {score}) in {(time.perf_counter() - t0) * 1e6:.0f}µs | {table}")
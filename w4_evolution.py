@@ -3,8 +3,10 @@
 # you keep the best guesses and mix them together to make new guesses.
 # This is how evolution works in nature too - the best traits get passed on!
 
+import heapq  # This grabs the top few from a pile WITHOUT sorting the whole pile
 import random  # This lets us make random choices, like rolling dice
 import string  # This gives us all the letters we can use
+from functools import lru_cache  # This remembers answers we already worked out
 
 # Our secret word we want to evolve into
 TARGET = "STOKED"
@@ -18,57 +20,68 @@ def get_random_string():
     # Like if the target is "CAT", it might make "QZX" or "BLA"
     return ''.join(random.choice(string.ascii_uppercase) for _ in range(len(TARGET)))
 
+# Once the population settles down, most guesses are clones of each other,
+# so we remember each guess's score instead of re-counting it every time
+# (the oldest ones get forgotten once we've remembered 10,000)
+@lru_cache(maxsize=10_000)
 def get_fitness(guess):
     # This scores how close our guess is to the target
     # For each letter that matches, we get 1 point
     # So if target is "CAT" and guess is "COT", fitness is 2 (C and T match)
     return sum(1 for g, t in zip(guess, TARGET) if g == t)
 
-# 1. CREATE INITIAL POPULATION
-# We start with 100 completely random guesses
-# This is like having 100 monkeys typing randomly - most will be gibberish!
-population = [get_random_string() for _ in range(POP_SIZE)]
+# Everything below only runs when you run this file directly
+# (`python w4_evolution.py`), not when another file imports get_fitness & co.
+# For reusing the GA with your own fitness function, see w4_ga_framework.py.
+if __name__ == "__main__":
+    # 1. CREATE INITIAL POPULATION
+    # We start with 100 completely random guesses
+    # This is like having 100 monkeys typing randomly - most will be gibberish!
+    population = [get_random_string() for _ in range(POP_SIZE)]
 
-# We'll try up to 1000 generations (rounds of evolution)
-for gen in range(1000):
-    # 2. SCORE EVERYONE
-    # Sort all our guesses from best to worst
-    # The best guess is the one with the highest fitness score
-    population = sorted(population, key=lambda x: get_fitness(x), reverse=True)
-    best = population[0]  # The best guess in this generation
-    print(f"Gen {gen}: {best} | Fitness: {get_fitness(best)}")
+    # We'll try up to 1000 generations (rounds of evolution)
+    for gen in range(1000):
+        # 2. SCORE EVERYONE
+        # Only the top 20 ever get to be parents, so we just grab those 20
+        # (best first) instead of sorting all 100 from best to worst
+        population = heapq.nlargest(20, population, key=get_fitness)
+        best = population[0]  # The best guess in this generation
+        print(f"Gen {gen}: {best} | Fitness: {get_fitness(best)}")
 
-    # If our best guess is perfect, we're done!
-    if best == TARGET:
-        print("W! Evolution finished the job. fr fr.")
-        break
+        # If our best guess is perfect, we're done!
+        if best == TARGET:
+            print("W! Evolution finished the job. fr fr.")
+            break
 
-    # 3. SELECTION & CROSSOVER
-    # We keep the best guess (this is called "elitism" - the best survive!)
-    new_pop = [best]
+        # 3. SELECTION & CROSSOVER
+        # We keep the best guess (this is called "elitism" - the best survive!)
+        new_pop = [best]
 
-    # Now we make new guesses by mixing the best ones
-    while len(new_pop) < POP_SIZE:
-        # Pick 2 parents from the top 20 best guesses
-        p1, p2 = random.sample(population[:20], 2)
+        # Now we make new guesses by mixing the best ones
+        while len(new_pop) < POP_SIZE:
+            # Pick 2 parents from the top 20 best guesses
+            p1, p2 = random.sample(population[:20], 2)
 
-        # Mix the parents together like shuffling two decks of cards
-        # We pick a random spot to split them and combine
-        split = random.randint(1, len(TARGET)-1)
-        child = p1[:split] + p2[split:]
+            # Mix the parents together like shuffling two decks of cards
+            # We pick a random spot to split them and combine
+            split = random.randint(1, len(TARGET)-1)
+            child = p1[:split] + p2[split:]
 
-        # 4. MUTATION
-        # Sometimes a random letter gets changed (like a typo)
-        # This helps us explore new possibilities
-        child = list(child)
-        if random.random() < MUTATION_RATE:
-            # Pick a random position and change it to a random letter
-            child[random.randint(0, len(TARGET)-1)] = random.choice(string.ascii_uppercase)
+            # 4. MUTATION
+            # Sometimes a random letter gets changed (like a typo)
+            # This helps us explore new possibilities
+            child = list(child)
+            if random.random() < MUTATION_RATE:
+                # Pick a random position and change it to a random letter
+                child[random.randint(0, len(TARGET)-1)] = random.choice(string.ascii_uppercase)
 
-        new_pop.append(''.join(child))
+            new_pop.append(''.join(child))
 
-    # Replace the old population with our new, improved population
-    population = new_pop
+        # Replace the old population with our new, improved population
+        population = new_pop
+
+    # How much work did the memory save us? (hits = scores we didn't re-count)
+    print(f"Fitness memory: {get_fitness.cache_info()}")
 
 # Student Task:
 # 1. Run the evolution. How many generations did it take?
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EVOLUTION ENGINE: The "Whole Population At Once" Edition 🧬⚡
+
+`w4_evolution.py` breeds strings one at a time: sort everyone with a Python
+lambda, glue children together with string slicing, list() and join() them
+for mutation... Fine for 100 six-letter guesses. Ask it for 100,000 guesses
+at a 2,000-letter target and you'll be waiting till next summer.
+
+Here the WHOLE population is one NumPy matrix:
+- Every guess is a row, every letter is a column, stored as a small number
+  (0 = 'A', 1 = 'B', ...), so shape is (POP_SIZE, len(TARGET)), dtype uint8.
+- **Fitness** = compare the whole matrix to the target row in one go, count
+  the matches per row. No Python loop over anyone.
+- **Crossover** = every child is dad's row with a chunk of mum's row copied
+  over the front. Kids with the same split point get copied in one block.
+- **Mutation** = pick all the typo spots for the whole generation at once
+  and drop random letters in, one fancy-indexing assignment.
+
+Same algorithm as the original (elitism, parents from the top 20, one-point
+crossover, a 5% mutation chance), just done for everyone at once.
+
+JS Analogy:
+```js
+// Instead of population.map(guess => score(guess)) with objects,
+// it's one typed array and a tight loop the engine can vectorise:
+const pop = new Uint8Array(POP_SIZE * LEN);
+```
+"""
+
+# YOU NEED: pip install numpy
+import string
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# The original only knew A-Z, so "MAGNUS IS THE GOAT" could never be reached
+# (there's no space to mutate into). We add the space.
+ALPHABET = string.ascii_uppercase + " "
+
+# What `evolve` hands back
+GAResult = namedtuple("GAResult",
+                      ["best", "fitness", "generations", "found", "elapsed", "evaluations"])
+
+
+def encode(text, alphabet=ALPHABET):
+    """A string as a uint8 row of alphabet positions ("CAB" -> [2, 0, 1])."""
+    lookup = {ch: i for i, ch in enumerate(alphabet)}
+    try:
+        return np.array([lookup[ch] for ch in text], dtype=np.uint8)
+    except KeyError as err:
+        raise ValueError(f"{err.args[0]!r} isn't in the alphabet {alphabet!r}") from None
+
+
+def decode(genome, alphabet=ALPHABET):
+    """A uint8 row back to a string."""
+    return "".join(alphabet[i] for i in genome.tolist())
+
+
+def random_population(rng, pop_size, length, alphabet_size=len(ALPHABET), dtype=np.uint8):
+    """`pop_size` random guesses, as a (pop_size, length) matrix (uint8 = up to 256 letters)."""
+    return rng.integers(0, alphabet_size, size=(pop_size, length), dtype=dtype)
+
+
+def fitness(population, target):
+    """Matching letters per guess: one comparison + count for the whole matrix."""
+    return np.count_nonzero(population == target, axis=1)
+
+
+def top_k(scores, k):
+    """
+    Indices of the `k` best scores, best first - WITHOUT sorting everyone.
+
+    `np.argpartition` drags the top k to the front in one linear pass (like
+    quickselect), then only those k get sorted. With 100k guesses and a
+    parent pool of 20 that's sorting 20 numbers instead of 100,000.
+    """
+    k = min(k, len(scores))
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class FitnessCache:
+    """
+    Remembers what your (slow) fitness function said about each guess.
+
+    Once a population converges it's mostly copies of the same few guesses,
+    so a costly `fn(guess) -> score` should run ONCE per different guess,
+    not once per copy. Duplicates inside a generation are found in one
+    vectorised `np.unique`; repeats across generations come out of a
+    size-capped memory that forgets the least recently used guess first.
+
+    Args:
+        fn: `fn(guess_string) -> number`, like `w4_evolution.get_fitness`.
+        capacity (int): Max guesses to remember.
+        alphabet (str): To turn genome rows back into strings for `fn`.
+    """
+
+    def __init__(self, fn, capacity=1 << 16, alphabet=ALPHABET):
+        self.fn = fn
+        self.capacity = capacity
+        self.alphabet = alphabet
+        self._entries = OrderedDict()  # genome bytes -> score
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __call__(self, population):
+        """Scores for every row of `population` (a float64 array)."""
+        unique, inverse = np.unique(population, axis=0, return_inverse=True)
+        entries = self._entries
+        scores = np.empty(len(unique), dtype=np.float64)
+        for i, genome in enumerate(unique):
+            key = genome.tobytes()
+            score = entries.get(key)
+            if score is None:
+                self.misses += 1
+                score = self.fn(decode(genome, self.alphabet))
+                entries[key] = score
+                if len(entries) > self.capacity:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self.hits += 1
+                entries.move_to_end(key)
+            scores[i] = score
+        # Copies in this generation count as hits too (they never called fn)
+        self.hits += len(population) - len(unique)
+        return scores[inverse.reshape(-1)]
+
+    def __repr__(self):
+        return (f"FitnessCache(size={len(self)}, hits={self.hits}, "
+                f"misses={self.misses}, evictions={self.evictions})")
+
+
+def pick_parents(rng, n, pool_size):
+    """`n` pairs of (different) parent indices from the top `pool_size`."""
+    mums = rng.integers(0, pool_size, size=n)
+    dads = rng.integers(0, pool_size - 1, size=n)
+    dads += dads >= mums  # Skip over mum, so nobody breeds with themselves
+    return mums, dads
+
+
+def crossover(rng, parents, mums, dads):
+    """
+    One-point crossover for every pair at once: child i takes
+    `parents[mums[i]]`'s letters before its random split point and
+    `parents[dads[i]]`'s letters after it.
+
+    Children are grouped by split point, so each group is ONE block copy
+    (at most len(TARGET) - 1 groups, however big the population is).
+    """
+    n, length = len(mums), parents.shape[1]
+    children = parents[dads]
+    if length < 2:
+        return children
+    splits = rng.integers(1, length, size=n)
+    order = np.argsort(splits, kind="stable")
+    sorted_splits = splits[order]
+    edges = np.flatnonzero(np.diff(sorted_splits)) + 1
+    for rows in np.split(order, edges):
+        split = splits[rows[0]]
+        children[rows, :split] = parents[mums[rows], :split]
+    return children
+
+
+def mutate(rng, children, rate, alphabet_size=len(ALPHABET), gene_rate=None):
+    """
+    Mutate `children` in place.
+
+    Default (like the original): each child has a `rate` chance of ONE random
+    letter being swapped for a random letter. With `gene_rate` set, instead
+    EVERY letter independently has that chance (much better for long targets,
+    where one typo per child is way too slow to fix the last few letters).
+    """
+    n, length = children.shape
+    if gene_rate is not None:
+        # Draw HOW MANY letters flip, then where - not a random number per letter
+        flips = rng.binomial(children.size, gene_rate)
+        where = rng.integers(0, children.size, size=flips)
+        children.reshape(-1)[where] = rng.integers(0, alphabet_size, size=flips,
+                                                   dtype=children.dtype)
+        return children
+    who = np.flatnonzero(rng.random(n) < rate)
+    where = rng.integers(0, length, size=len(who))
+    children[who, where] = rng.integers(0, alphabet_size, size=len(who), dtype=children.dtype)
+    return children
+
+
+def breed(rng, population, scores, parent_pool=20, mutation_rate=0.05,
+          alphabet_size=len(ALPHABET), gene_rate=None):
+    """
+    One generation: the best guess survives as-is (elitism), everyone else is
+    a mutated child of two parents from the top `parent_pool`.
+
+    Returns the new population (same shape); `population` isn't touched.
+    """
+    ranked = top_k(scores, parent_pool)  # Only the parent pool gets sorted
+    parents = population[ranked]
+    elite = population[ranked[0]].copy()
+    mums, dads = pick_parents(rng, len(population), len(parents))
+    children = crossover(rng, parents, mums, dads)
+    mutate(rng, children, mutation_rate, alphabet_size, gene_rate)
+    children[0] = elite  # The best guess always survives untouched
+    return children
+
+
+def evolve(target, pop_size=100, mutation_rate=0.05, parent_pool=20, max_generations=1000,
+           seed=None, alphabet=ALPHABET, gene_rate=None, fitness_fn=None, cache_size=1 << 16,
+           verbose=False):
+    """
+    Evolve random gibberish into `target` (the w4_evolution loop, vectorised).
+
+    Args:
+        target (str): The secret word.
+        pop_size (int): Guesses per generation.
+        mutation_rate (float): Chance a child gets one random typo.
+        parent_pool (int): Parents are picked from this many of the best.
+        max_generations (int): Give up after this many.
+        seed: Seed for NumPy's random generator (same seed = same run).
+        alphabet (str): Letters a guess can use.
+        gene_rate (float): Per-letter mutation instead (see `mutate`).
+        fitness_fn: Your own `fn(guess_string) -> score` (bigger = better)
+            instead of counting matching letters. It's wrapped in a
+            `FitnessCache` (or pass your own `FitnessCache` to see its stats).
+            The run still stops when a guess equals `target`.
+        cache_size (int): How many guesses the cache remembers.
+        verbose (bool): Print the best guess every generation, like the original.
+
+    Returns:
+        GAResult(best, fitness, generations, found, elapsed, evaluations) -
+        `evaluations` is how many guesses actually got scored.
+    """
+    if pop_size < 2 or parent_pool < 2:
+        raise ValueError("Need at least 2 guesses and 2 parents to breed")
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    goal = encode(target, alphabet)
+    length = len(goal)
+    parent_pool = min(parent_pool, pop_size)
+    population = random_population(rng, pop_size, length, len(alphabet))
+    cache = None
+    if fitness_fn is not None:
+        cache = fitness_fn if isinstance(fitness_fn, FitnessCache) else \
+            FitnessCache(fitness_fn, cache_size, alphabet)
+        misses_before = cache.misses
+    evaluations = 0
+
+    for gen in range(max_generations):
+        if cache is None:
+            scores = fitness(population, goal)
+            evaluations += pop_size
+        else:
+            scores = cache(population)
+            evaluations = cache.misses - misses_before
+        best = int(np.argmax(scores))
+        if verbose:
+            print(f"Gen {gen}: {decode(population[best], alphabet)} | Fitness: {scores[best]}")
+        if np.array_equal(population[best], goal):
+            return GAResult(decode(population[best], alphabet), scores[best].item(), gen, True,
+                            time.perf_counter() - started, evaluations)
+
+        population = breed(rng, population, scores, parent_pool, mutation_rate,
+                           len(alphabet), gene_rate)
+
+    if cache is None:
+        scores = fitness(population, goal)
+        evaluations += pop_size
+    else:
+        scores = cache(population)
+        evaluations = cache.misses - misses_before
+    best = int(np.argmax(scores))
+    return GAResult(decode(population[best], alphabet), scores[best].item(), max_generations,
+                    False, time.perf_counter() - started, evaluations)
+
+
+if __name__ == "__main__":
+    for target in ("STOKED", "MAGNUS IS THE GOAT"):
+        result = evolve(target, seed=0)
+        print(f"{target!r}: {'W' if result.found else 'L'} after {result.generations} "
+              f"generations in {result.elapsed:.3f}s")
+
+    # A "slow" hand-written fitness function: the cache makes sure it only
+    # ever runs once per different guess
+    def slow_fitness(guess, target="MAGNUS IS THE GOAT"):
+        time.sleep(0.0001)  # Pretend it's a physics sim or something
+        return sum(1 for g, t in zip(guess, target) if g == t)
+
+    cache = FitnessCache(slow_fitness)
+    result = evolve("MAGNUS IS THE GOAT", seed=0, fitness_fn=cache)
+    print(f"Custom fitness: {'W' if result.found else 'L'} after {result.generations} generations, "
+          f"{result.evaluations} real calls for {(result.generations + 1) * 100} guesses "
+          f"in {result.elapsed:.2f}s | {cache}")
+
+    # A 1,000-letter target (random letters) with per-letter mutation
+    rng = np.random.default_rng(1)
+    long_target = decode(rng.integers(0, len(ALPHABET), size=1000, dtype=np.uint8))
+    result = evolve(long_target, pop_size=1000, gene_rate=1 / 1000, max_generations=5000, seed=2)
+    print(f"1,000-letter target: {'W' if result.found else 'L'} after {result.generations} "
+          f"generations in {result.elapsed:.1f}s")
+
+    # Raw speed: 100k guesses x 2,000 letters per generation
+    huge_target = decode(rng.integers(0, len(ALPHABET), size=2000, dtype=np.uint8))
+    result = evolve(huge_target, pop_size=100_000, gene_rate=1 / 2000, max_generations=10, seed=3)
+    print(f"100k x 2,000 letters: {result.generations} generations in {result.elapsed:.1f}s "
+          f"({result.elapsed / result.generations * 1000:.0f}ms each), best {result.fitness}/2000")
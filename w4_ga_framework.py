@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GA FRAMEWORK: Bring Your Own Fitness Function 🧰🧬
+
+`w4_evolution.py` (and `evolve` in the engine) only know one trick: spell a
+target word. But a GA doesn't care WHAT it's evolving - a schedule, a
+neural net's weights, a surfboard shape - as long as you can:
+1. write a genome down as a row of small numbers, and
+2. score a whole bunch of genomes.
+
+So this is the same loop with the "spelling" bits pulled out into plug-ins:
+- **Genome**: `length` genes, each one of `alleles` values (0..alleles-1).
+- **evaluate(population) -> scores**: YOU get the whole (pop_size, length)
+  matrix at once, so you can vectorise it, send it to a GPU, fire it off to
+  a server farm... Bigger score = better.
+- **Operators**: `crossover`, `mutate` and `select` are swappable functions
+  (the engine's vectorised ones by default).
+- **Checkpoints**: every N generations, the population, the scores and the
+  random generator's exact state get saved to disk. If your 6-hour run dies
+  at hour 5, `run()` picks up from the last checkpoint - and carries on
+  EXACTLY as if it never crashed (same seed = same answer either way).
+
+Usage:
+```python
+ga = GeneticAlgorithm(my_evaluate, length=50, alleles=2, seed=1,
+                      checkpoint_path="run.npz", checkpoint_every=100)
+result = ga.run(max_generations=10_000, target_fitness=50)
+```
+
+JS Analogy:
+```js
+// Like a library that takes callbacks instead of hard-coding the logic:
+const ga = new GeneticAlgorithm({ evaluate: pop => scores, mutate, crossover });
+```
+"""
+
+# YOU NEED: pip install numpy
+import json
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from w4_evolution_engine import crossover as one_point_crossover
+from w4_evolution_engine import encode, fitness, pick_parents, random_population, top_k
+from w4_evolution_engine import mutate as random_mutate
+
+CHECKPOINT_VERSION = 1
+
+# What `GeneticAlgorithm.run` hands back (`best` is the genome row itself)
+RunResult = namedtuple("RunResult",
+                       ["best", "fitness", "generations", "found", "elapsed", "evaluations"])
+
+
+def match_target(target, alphabet):
+    """An `evaluate` hook for the classic "spell the word" game."""
+    goal = encode(target, alphabet)
+    return lambda population: fitness(population, goal)
+
+
+class GeneticAlgorithm:
+    """
+    A reusable GA: you bring `evaluate`, it brings the evolving.
+
+    Args:
+        evaluate: `evaluate(population) -> scores`, population is a
+            (pop_size, length) array, scores a 1D array (bigger = better).
+        length (int): Genes per genome.
+        alleles (int): Each gene is 0..alleles-1 (must fit in `dtype`).
+        pop_size (int): Genomes per generation.
+        parent_pool (int): Parents come from this many of the best.
+        mutation_rate (float): Chance a child gets one random mutation.
+        gene_rate (float): Per-gene mutation chance instead (see `mutate`).
+        crossover: `crossover(rng, parents, mums, dads) -> children`.
+        mutate: `mutate(rng, children) -> children` (in place is fine).
+            Default: the engine's `mutate` with the rates above.
+        select: `select(scores, k) -> indices of the k best, best first`.
+        seed: Seed for the random generator.
+        checkpoint_path (str): Save here (a .npz file). None = never save.
+        checkpoint_every (int): Generations between saves.
+        dtype: Gene storage type (uint8 = up to 256 alleles).
+    """
+
+    def __init__(self, evaluate, length, alleles, pop_size=100, parent_pool=20,
+                 mutation_rate=0.05, gene_rate=None, crossover=one_point_crossover,
+                 mutate=None, select=top_k, seed=None, checkpoint_path=None,
+                 checkpoint_every=100, dtype=np.uint8):
+        if pop_size < 2 or parent_pool < 2:
+            raise ValueError("Need at least 2 genomes and 2 parents to breed")
+        if alleles - 1 > np.iinfo(dtype).max:
+            raise ValueError(f"{alleles} alleles don't fit in {np.dtype(dtype).name}")
+        self.evaluate = evaluate
+        self.length = length
+        self.alleles = alleles
+        self.pop_size = pop_size
+        self.parent_pool = min(parent_pool, pop_size)
+        self.crossover = crossover
+        self.mutate = mutate or (lambda rng, children: random_mutate(
+            rng, children, mutation_rate, alleles, gene_rate))
+        self.select = select
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.dtype = np.dtype(dtype)
+
+        self.rng = np.random.default_rng(seed)
+        self.population = random_population(self.rng, pop_size, length, alleles, self.dtype)
+        self.scores = None
+        self.generation = 0
+        self.evaluations = 0
+
+    def _score(self):
+        scores = np.asarray(self.evaluate(self.population))
+        if scores.shape != (self.pop_size,):
+            raise ValueError(f"evaluate() returned shape {scores.shape}, "
+                             f"expected ({self.pop_size},) - one score per genome")
+        self.scores = scores
+        self.evaluations += self.pop_size
+
+    def step(self):
+        """One generation: keep the best, breed the rest, score them."""
+        if self.scores is None:
+            self._score()
+        ranked = self.select(self.scores, self.parent_pool)
+        parents = self.population[ranked]
+        elite = self.population[ranked[0]].copy()
+        mums, dads = pick_parents(self.rng, self.pop_size, len(parents))
+        children = self.crossover(self.rng, parents, mums, dads)
+        children = self.mutate(self.rng, children)
+        children[0] = elite  # The best genome always survives untouched
+        self.population = children
+        self.generation += 1
+        self._score()
+
+    def best(self):
+        """(genome, score) of the best genome right now."""
+        if self.scores is None:
+            self._score()
+        i = int(np.argmax(self.scores))
+        return self.population[i].copy(), self.scores[i].item()
+
+    # --- Checkpoints ------------------------------------------------------
+
+    def save(self, path=None):
+        """
+        Save everything needed to carry on later (the population, its scores,
+        the generation count and the random generator's state).
+
+        Written to a temp file first and then swapped in, so a crash halfway
+        through a save never leaves a broken checkpoint behind.
+        """
+        path = path or self.checkpoint_path
+        if self.scores is None:
+            self._score()
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, version=CHECKPOINT_VERSION, population=self.population,
+                     scores=self.scores, generation=self.generation,
+                     evaluations=self.evaluations, alleles=self.alleles,
+                     rng_state=json.dumps(self.rng.bit_generator.state))
+        os.replace(tmp, path)
+
+    def load(self, path=None):
+        """Pick up from a checkpoint made by `save` (same settings, please)."""
+        path = path or self.checkpoint_path
+        with np.load(path) as data:
+            if int(data["version"]) != CHECKPOINT_VERSION:
+                raise ValueError(f"{path} is checkpoint v{int(data['version'])}, "
+                                 f"we only speak v{CHECKPOINT_VERSION}")
+            population = data["population"]
+            if population.shape != (self.pop_size, self.length) or int(data["alleles"]) != self.alleles:
+                raise ValueError(f"{path} is a {population.shape} population with "
+                                 f"{int(data['alleles'])} alleles, but this GA is "
+                                 f"({self.pop_size}, {self.length}) with {self.alleles}")
+            self.population = population.astype(self.dtype)
+            self.scores = data["scores"]
+            self.generation = int(data["generation"])
+            self.evaluations = int(data["evaluations"])
+            state = json.loads(str(data["rng_state"]))
+        if state["bit_generator"] != type(self.rng.bit_generator).__name__:
+            raise ValueError(f"{path} was saved with a {state['bit_generator']} generator")
+        self.rng.bit_generator.state = state
+
+    # --- The loop -----------------------------------------------------------
+
+    def run(self, max_generations=1000, target_fitness=None, resume=True, callback=None):
+        """
+        Evolve until `target_fitness` is reached or `max_generations` have
+        passed (counting from generation 0, so a resumed run stops at the
+        same place an unbroken one would).
+
+        Args:
+            max_generations (int): Stop at this generation.
+            target_fitness: Stop as soon as the best score reaches this.
+            resume (bool): If the checkpoint file exists AND is further along
+                than this GA, carry on from it. (Calling `run()` again on a GA
+                that's already past its last save just keeps going - it never
+                rewinds to the older checkpoint.)
+            callback: `callback(ga)` after every generation (for printing,
+                plotting...). Return True from it to stop early.
+
+        Returns:
+            RunResult(best, fitness, generations, found, elapsed, evaluations)
+        """
+        started = time.perf_counter()
+        if resume and self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with np.load(self.checkpoint_path) as data:
+                saved_at = int(data["generation"])  # Only reads this one field
+            if saved_at > self.generation:
+                self.load()
+        if self.scores is None:
+            self._score()
+
+        found = False
+        while True:
+            best_score = self.scores.max()
+            if target_fitness is not None and best_score >= target_fitness:
+                found = True
+                break
+            if self.generation >= max_generations:
+                break
+            self.step()
+            if self.checkpoint_path and self.generation % self.checkpoint_every == 0:
+                self.save()
+            if callback is not None and callback(self):
+                break
+
+        genome, score = self.best()
+        return RunResult(genome, score, self.generation, found,
+                         time.perf_counter() - started, self.evaluations)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from w4_evolution_engine import ALPHABET, decode
+
+    # 1. The classic, through the framework
+    target = "MAGNUS IS THE GOAT"
+    ga = GeneticAlgorithm(match_target(target, ALPHABET), len(target), len(ALPHABET), seed=0)
+    result = ga.run(target_fitness=len(target))
+    print(f"Spelling: {decode(result.best)!r} after {result.generations} generations")
+
+    # 2. Something completely different: a 64-bit genome scored by a
+    #    vectorised "knapsack" (pack the most value under a weight limit)
+    rng = np.random.default_rng(42)
+    values, weights = rng.integers(1, 100, 64), rng.integers(1, 50, 64)
+    limit = weights.sum() // 3
+
+    def knapsack(population):
+        value, weight = population @ values, population @ weights
+        return np.where(weight <= limit, value, 0)  # Too heavy = worthless
+
+    # 3. Crash and resume: run 300 generations in one go, then 150 + "crash" + 150
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = dict(length=64, alleles=2, pop_size=200, gene_rate=1 / 64, seed=7)
+        straight = GeneticAlgorithm(knapsack, **settings).run(max_generations=300)
+
+        path = os.path.join(tmp, "knapsack.npz")
+        first = GeneticAlgorithm(knapsack, checkpoint_path=path, checkpoint_every=50, **settings)
+        first.run(max_generations=150)
+        del first  # 💥 "crash"
+        second = GeneticAlgorithm(knapsack, checkpoint_path=path, checkpoint_every=50, **settings)
+        resumed = second.run(max_generations=300)
+
+    same = np.array_equal(straight.best, resumed.best)
+    print(f"Knapsack: best value {straight.fitness} (limit {limit}) | resumed run: "
+          f"{resumed.fitness} {'✅ identical' if same else '❌ DIFFERENT'}")
+
+    # 4. More than 256 alleles: a 1,000-value gene needs uint16. Each of 20
+    #    genes should land on its own secret number in 0..999.
+    secret = rng.integers(0, 1000, 20)
+    for gene_rate in (None, 1 / 20):
+        ga = GeneticAlgorithm(lambda population: (population == secret).sum(axis=1), length=20,
+                              alleles=1000, pop_size=500, gene_rate=gene_rate, seed=0,
+                              dtype=np.uint16)
+        result = ga.run(max_generations=3000, target_fitness=20)
+        print(f"1,000 alleles ({'per-gene' if gene_rate else 'per-child'} mutation): "
+              f"{result.fitness}/20 genes right after {result.generations} generations "
+              f"({result.best.dtype})")
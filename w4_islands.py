@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ISLAND MODEL: The "Galapagos Surf Trip" GA 🏝️🏝️🏝️
+
+One big population has a problem: after a while everyone's a clone of the
+same "pretty good" guess, and it sits there stuck on a Near-W (try the
+"MAGNUS IS THE GOAT" experiment in w4_evolution.py).
+
+Darwin's fix: islands. Split the population into N small groups that evolve
+on their own (each in its OWN process, so N cores = N islands at once), and
+every few generations a few of each island's best surfers paddle over to
+another island:
+- **Ring**: island 0 -> 1 -> 2 -> ... -> back to 0. Ideas spread slowly, so
+  the islands stay different for longer (more variety = fewer dead ends).
+- **All-to-all**: everyone sends to everyone. Ideas spread fast.
+
+Each island gets its own random seed (split off ONE master seed), and the
+migration happens at fixed generations, so the same seed gives the same run
+whether the islands are in 8 processes or 1. That's what lets us measure the
+wall-clock speedup fairly.
+
+JS Analogy:
+```js
+// Each island is a Web Worker; every `interval` generations they postMessage
+// their best few to the next worker, and wait for their own visitors.
+```
+"""
+
+# YOU NEED: pip install numpy
+import math
+import os
+import time
+from collections import namedtuple
+from multiprocessing import Pipe, Process
+
+import numpy as np
+
+from w4_evolution_engine import (ALPHABET, breed, decode, encode, fitness,
+                                 random_population, top_k)
+
+TOPOLOGIES = ("ring", "all")
+
+# What `run_islands` hands back. `found_at[i]` = the generation island i
+# first had the target (None = it never got there before we stopped).
+IslandResult = namedtuple("IslandResult",
+                          ["best", "fitness", "found", "found_at", "epochs", "elapsed"])
+
+
+class Island:
+    """One sub-population, its own RNG, and how far along it is."""
+
+    def __init__(self, target, seed, pop_size=100, mutation_rate=0.05, parent_pool=20,
+                 gene_rate=None, alphabet=ALPHABET):
+        self.rng = np.random.default_rng(seed)
+        self.goal = encode(target, alphabet)
+        self.alphabet_size = len(alphabet)
+        self.parent_pool = min(parent_pool, pop_size)
+        self.mutation_rate = mutation_rate
+        self.gene_rate = gene_rate
+        self.population = random_population(self.rng, pop_size, len(self.goal), len(alphabet))
+        self.scores = fitness(self.population, self.goal)
+        self.generation = 0
+        self.found_at = None
+        self._check()
+
+    def _check(self):
+        if self.found_at is None and self.scores.max() == len(self.goal):
+            self.found_at = self.generation
+
+    def welcome(self, migrants):
+        """Visitors from other islands replace this island's worst guesses."""
+        k = min(len(migrants), len(self.population) - 1)
+        if k <= 0:
+            return
+        worst = np.argpartition(self.scores, k - 1)[:k]
+        self.population[worst] = migrants[:k]
+        self.scores[worst] = fitness(self.population[worst], self.goal)
+        self._check()
+
+    def run(self, generations):
+        """Evolve up to `generations` more (stops early once it has the target)."""
+        for _ in range(generations):
+            if self.found_at is not None:
+                return
+            self.population = breed(self.rng, self.population, self.scores, self.parent_pool,
+                                    self.mutation_rate, self.alphabet_size, self.gene_rate)
+            self.generation += 1
+            self.scores = fitness(self.population, self.goal)
+            self._check()
+
+    def emigrants(self, k):
+        """Copies of this island's `k` best guesses (best first)."""
+        return self.population[top_k(self.scores, k)].copy()
+
+    def report(self, k):
+        # What the coordinator needs after each epoch. The best guess travels
+        # on its own, so we still know it when nobody migrates (k = 0)
+        best = int(np.argmax(self.scores))
+        return self.emigrants(k), int(self.scores[best]), self.found_at, self.population[best].copy()
+
+
+def _island_worker(conn, args):
+    # One process = one island. Waits for (migrants, generations, k),
+    # answers with a report; `None` means pack up and go home.
+    island = Island(*args)
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        migrants, generations, k = job
+        island.welcome(migrants)
+        island.run(generations)
+        conn.send(island.report(k))
+    conn.close()
+
+
+def _incoming(outgoing, topology):
+    # Who receives what: ring = from the island before you, all = from everyone else
+    n = len(outgoing)
+    if topology == "ring":
+        return [outgoing[(i - 1) % n] for i in range(n)]
+    if n == 1:  # A lone island has nobody else to hear from
+        return [outgoing[0][:0]]
+    return [np.concatenate([outgoing[j] for j in range(n) if j != i]) for i in range(n)]
+
+
+def run_islands(target, islands=None, pop_size=100, interval=10, migrants=2, topology="ring",
+                max_generations=5000, seed=0, stop="first", parallel=True,
+                mutation_rate=0.05, parent_pool=20, gene_rate=None, alphabet=ALPHABET):
+    """
+    Evolve `target` on several islands at once, with migration.
+
+    Args:
+        target (str): The secret word.
+        islands (int): How many islands (default: one per CPU core).
+        pop_size (int): Guesses PER island.
+        interval (int): Generations between migrations.
+        migrants (int): How many of its best each island sends per migration.
+        topology (str): "ring" or "all" (all-to-all).
+        max_generations (int): Give up after this many (per island).
+        seed (int): Master seed; island i gets its own child seed from it.
+        stop (str): "first" = stop when any island gets there,
+            "all" = keep going until every island has (for the metric).
+        parallel (bool): One process per island. False runs them all in
+            this process - same seed, same answers, just slower.
+        mutation_rate, parent_pool, gene_rate, alphabet: As in `evolve`.
+
+    Returns:
+        IslandResult(best, fitness, found, found_at, epochs, elapsed)
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r}, pick one of {TOPOLOGIES}")
+    if stop not in ("first", "all"):
+        raise ValueError(f"stop must be 'first' or 'all', not {stop!r}")
+    if migrants < 0:
+        raise ValueError(f"migrants can't be negative, got {migrants}")
+    if interval < 1 or max_generations < 1:
+        raise ValueError("interval and max_generations must be at least 1 generation")
+    encode(target, alphabet)  # Bad letters? Find out here, not inside 8 worker processes
+    started = time.perf_counter()
+    n = islands or os.cpu_count() or 1
+    seeds = np.random.SeedSequence(seed).spawn(n)
+    island_args = [(target, s, pop_size, mutation_rate, parent_pool, gene_rate, alphabet)
+                   for s in seeds]
+
+    if parallel:
+        pipes, procs = [], []
+        for args in island_args:
+            ours, theirs = Pipe()
+            proc = Process(target=_island_worker, args=(theirs, args), daemon=True)
+            proc.start()
+            theirs.close()
+            pipes.append(ours)
+            procs.append(proc)
+    else:
+        local = [Island(*args) for args in island_args]
+
+    length = len(target)
+    outgoing = [np.empty((0, length), dtype=np.uint8)] * n
+    epochs = 0
+    try:
+        for epoch in range(math.ceil(max_generations / interval)):
+            incoming = _incoming(outgoing, topology) if epoch else outgoing
+            generations = min(interval, max_generations - epoch * interval)
+            if parallel:
+                for conn, visitors in zip(pipes, incoming):
+                    conn.send((visitors, generations, migrants))
+                reports = [conn.recv() for conn in pipes]
+            else:
+                reports = []
+                for island, visitors in zip(local, incoming):
+                    island.welcome(visitors)
+                    island.run(generations)
+                    reports.append(island.report(migrants))
+            epochs += 1
+            outgoing = [r[0] for r in reports]
+            found_at = [r[2] for r in reports]
+            done = [f is not None for f in found_at]
+            if (stop == "first" and any(done)) or all(done):
+                break
+    finally:
+        if parallel:
+            for conn in pipes:
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, EOFError):
+                    pass  # That island's process already died - nothing to tell it
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+                    proc.join()
+
+    best_island = max(range(n), key=lambda i: reports[i][1])
+    best = decode(reports[best_island][3], alphabet)
+    return IslandResult(best, reports[best_island][1], any(done), found_at, epochs,
+                        time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    target = "MAGNUS IS THE GOAT"
+    cores = os.cpu_count() or 1
+    print(f"{cores} CPU core(s)")
+
+    for topology in TOPOLOGIES:
+        result = run_islands(target, islands=4, topology=topology, seed=1, stop="all")
+        print(f"{topology:>4}: found_at per island {result.found_at} "
+              f"({result.epochs} migrations) in {result.elapsed:.2f}s")
+
+    # Edge cases: one lone island (nobody to trade with), and no migration at all
+    for kwargs in (dict(islands=1, topology="all"), dict(islands=2, migrants=0)):
+        result = run_islands(target, seed=1, **kwargs)
+        print(f"{kwargs}: {result.best!r} found={result.found} after {result.epochs} epochs")
+
+    # Speedup: the same 8 islands (same seed = identical work) in 1 process vs many
+    rng = np.random.default_rng(3)
+    long_target = decode(rng.integers(0, len(ALPHABET), size=300, dtype=np.uint8))
+    kwargs = dict(islands=8, pop_size=2000, interval=20, seed=3, stop="all", gene_rate=1 / 300)
+    serial = run_islands(long_target, parallel=False, **kwargs)
+    para = run_islands(long_target, parallel=True, **kwargs)
+    same = serial.found_at == para.found_at
+    print(f"300-letter target, 8 islands: 1 process {serial.elapsed:.1f}s, "
+          f"8 processes {para.elapsed:.1f}s ({serial.elapsed / para.elapsed:.1f}x on {cores} core(s)) "
+          f"| found_at {para.found_at} {'✅ identical' if same else '❌ DIFFERENT'}")
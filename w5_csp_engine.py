@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CSP ENGINE: Colour ANY Map, Not Just Three Islands 🗺️🎨
+
+`w5_map_colouring.py` writes every rule out by hand ("Sumatra and Java can't
+match", "Java and Kalimantan can't match"...) and re-checks ALL of them every
+time it tries one crayon. Fine for 4 islands. Hopeless for a real map with
+40,000 regions, or a compiler colouring 20,000 variables into CPU registers
+(same problem: variables alive at the same time = neighbours, registers =
+colours).
+
+The trick: a new colour can only clash with the node's OWN neighbours. So:
+- The graph is stored as two integer arrays (the "CSR" format):
+      neighbours[offsets[v]:offsets[v + 1]]  =  everyone next to node v
+  No dicts of names, no per-rule functions - any graph at all fits.
+- Checking a colour = look at that node's neighbours only: O(degree), not
+  "re-check the whole map".
+- Backtracking is a loop with an explicit stack, not recursion, so 40,000
+  nodes don't blow Python's recursion limit (1,000 by default).
+
+And `solve_smart` is the same search with the classic shortcuts bolted on:
+- **MRV** ("minimum remaining values"): colour the node with the FEWEST
+  crayons left next - if it's going to fail, find out now. Ties go to the
+  node with the most neighbours (the "degree" heuristic).
+- **LCV** ("least constraining value"): try first the crayon that takes the
+  fewest options away from the neighbours.
+- **Forward checking**: after colouring a node, cross that colour off every
+  neighbour's list. Someone's list goes empty = dead end, spotted BEFORE we
+  wander 500 nodes further. Every cross-off goes on a "trail", so going back
+  just un-crosses the trail down to where we were (no copying of domains).
+- **AC-3** (optional, before the search): keep crossing off colours that
+  can't possibly work until nothing changes - great when some nodes are
+  already coloured in (a Sudoku is exactly that!).
+
+JS Analogy:
+```js
+// CSR is how you'd store a graph in typed arrays:
+const offsets = new Int32Array(n + 1);     // where each node's list starts
+const neighbours = new Int32Array(edges);  // all the lists, back to back
+for (let i = offsets[v]; i < offsets[v + 1]; i++) visit(neighbours[i]);
+```
+"""
+
+# YOU NEED: pip install numpy
+import heapq
+import time
+from collections import deque, namedtuple
+
+import numpy as np
+
+UNCOLOURED = -1
+
+# What `solve` hands back. `colours[v]` = colour index of node v (or -1).
+# `prunings` = colours crossed off by forward checking / AC-3 (0 for `solve`).
+ColouringResult = namedtuple("ColouringResult",
+                             ["colours", "solved", "nodes", "backtracks", "elapsed", "prunings"],
+                             defaults=(0,))
+
+
+class Graph:
+    """
+    An undirected graph in CSR form: node v's neighbours are
+    `neighbours[offsets[v]:offsets[v + 1]]`.
+
+    Build one with `Graph.from_edges` or `Graph.from_adjacency` rather than
+    by hand (they remove duplicates and add both directions of every edge).
+    """
+
+    def __init__(self, offsets, neighbours, names=None):
+        self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+        self.neighbours = np.ascontiguousarray(neighbours, dtype=np.int32)
+        self.n = len(self.offsets) - 1
+        if self.n < 0 or self.offsets[0] != 0 or self.offsets[-1] != len(self.neighbours):
+            raise ValueError("offsets must start at 0 and end at len(neighbours)")
+        if np.any(np.diff(self.offsets) < 0):
+            raise ValueError("offsets must never go down")
+        if len(self.neighbours) and (self.neighbours.min() < 0 or self.neighbours.max() >= self.n):
+            raise ValueError(f"neighbours must be node numbers 0..{self.n - 1}")
+        self.names = list(names) if names is not None else None
+        self.degree = np.diff(self.offsets)
+        # Python lists for the hot loops (indexing a list beats indexing NumPy one at a time)
+        self._offsets = self.offsets.tolist()
+        self._neighbours = self.neighbours.tolist()
+
+    @classmethod
+    def from_edges(cls, n, edges, names=None):
+        """`n` nodes and an (E, 2) list/array of [u, v] pairs (either order is fine)."""
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges) and (edges.min() < 0 or edges.max() >= n):
+            raise ValueError(f"Edges must use node numbers 0..{n - 1}")
+        if np.any(edges[:, 0] == edges[:, 1]):
+            bad = int(edges[edges[:, 0] == edges[:, 1]][0, 0])
+            raise ValueError(f"Node {bad} is its own neighbour - it can never be coloured")
+        both = np.concatenate([edges, edges[:, ::-1]])
+        both = np.unique(both, axis=0)  # Sorted by node, duplicates gone
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(both[:, 0], minlength=n), out=offsets[1:])
+        return cls(offsets, both[:, 1], names)
+
+    @classmethod
+    def from_adjacency(cls, adjacency):
+        """From {"Java": ["Sumatra", "Kalimantan"], ...} (names become node numbers)."""
+        index = {}  # name -> node number (a dict, so "seen it yet?" is O(1))
+        for name in adjacency:
+            index.setdefault(name, len(index))
+        for others in adjacency.values():
+            for other in others:
+                index.setdefault(other, len(index))
+        names = list(index)
+        edges = [(index[a], index[b]) for a, others in adjacency.items() for b in others]
+        return cls.from_edges(len(names), edges, names)
+
+    def neighbours_of(self, v):
+        return self.neighbours[self.offsets[v]:self.offsets[v + 1]]
+
+    def __repr__(self):
+        return f"Graph(nodes={self.n}, edges={len(self.neighbours) // 2})"
+
+
+def check_colouring(graph, colours):
+    """True if every node is coloured and no edge joins two matching colours."""
+    colours = np.asarray(colours)
+    if len(colours) != graph.n or np.any(colours == UNCOLOURED):
+        return False
+    owners = np.repeat(np.arange(graph.n), graph.degree)
+    return not np.any(colours[owners] == colours[graph.neighbours])
+
+
+def bfs_order(graph):
+    """
+    Nodes in breadth-first order, starting from the busiest node.
+
+    Neighbours end up close together in the order, so a bad colour gets
+    caught a few steps later instead of 30,000 steps later.
+    """
+    offsets, neighbours = graph._offsets, graph._neighbours
+    seen = bytearray(graph.n)
+    order = []
+    for root in np.argsort(-graph.degree, kind="stable").tolist():
+        if seen[root]:
+            continue
+        seen[root] = 1
+        queue = deque([root])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for u in neighbours[offsets[v]:offsets[v + 1]]:
+                if not seen[u]:
+                    seen[u] = 1
+                    queue.append(u)
+    return order
+
+
+def solve(graph, k, order=None, max_nodes=None):
+    """
+    Colour `graph` with colours 0..k-1 by backtracking.
+
+    Args:
+        graph (Graph): What to colour.
+        k (int): How many colours.
+        order: The order to colour nodes in (default: `bfs_order`).
+        max_nodes (int): Give up after this many colour assignments.
+
+    Returns:
+        ColouringResult(colours, solved, nodes, backtracks, elapsed) -
+        `colours` is an int array (-1 = uncoloured), `nodes` counts colour
+        assignments tried, `backtracks` counts "un-colour and go back" steps.
+    """
+    started = time.perf_counter()
+    n = graph.n
+    order = bfs_order(graph) if order is None else [int(v) for v in order]
+    if sorted(order) != list(range(n)):
+        raise ValueError("order must list every node exactly once")
+    offsets, neighbours = graph._offsets, graph._neighbours
+    colour = [UNCOLOURED] * n
+    next_try = [0] * (n + 1)  # Next colour to try at each position in `order`
+    nodes = backtracks = 0
+    pos = 0
+    while 0 <= pos < n:
+        if max_nodes is not None and nodes >= max_nodes:
+            break
+        v = order[pos]
+        colour[v] = UNCOLOURED
+        # O(degree): only v's own neighbours can clash with it
+        taken = {colour[u] for u in neighbours[offsets[v]:offsets[v + 1]]}
+        c = next_try[pos]
+        while c < k and c in taken:
+            c += 1
+        if c < k:
+            colour[v] = c
+            nodes += 1
+            next_try[pos] = c + 1
+            pos += 1
+            next_try[pos] = 0
+        else:
+            next_try[pos] = 0  # Out of crayons here: go back one and change that
+            pos -= 1
+            backtracks += 1
+
+    return ColouringResult(np.array(colour, dtype=np.int16), pos == n, nodes, backtracks,
+                           time.perf_counter() - started)
+
+
+def _initial_domains(graph, k, domains):
+    # Everyone gets every crayon, unless the caller says otherwise
+    if domains is None:
+        return [set(range(k)) for _ in range(graph.n)]
+    if len(domains) != graph.n:
+        raise ValueError(f"Need one domain per node ({graph.n}), got {len(domains)}")
+    domains = [set(int(c) for c in d) for d in domains]
+    for v, d in enumerate(domains):
+        if any(c < 0 or c >= k for c in d):
+            raise ValueError(f"Node {v} has colours outside 0..{k - 1}: {sorted(d)}")
+    return domains
+
+
+def ac3(graph, domains):
+    """
+    Arc consistency: cross off colour c from node x whenever some neighbour
+    y has ONLY c left (y is going to be c, so x can't be). Repeat until
+    nothing changes. Edits `domains` (a list of sets) in place.
+
+    Returns:
+        (ok, removed): ok=False means some node ran out of colours, so
+        there's no answer at all. `removed` = how many colours got crossed off.
+    """
+    offsets, neighbours = graph._offsets, graph._neighbours
+    # Only a neighbour down to ONE colour can ever knock anything out, so
+    # start from those and only re-queue nodes that just got down to one
+    queue = deque(v for v in range(graph.n) if len(domains[v]) == 1)
+    removed = 0
+    while queue:
+        y = queue.popleft()
+        if not domains[y]:
+            return False, removed
+        (c,) = domains[y]
+        for x in neighbours[offsets[y]:offsets[y + 1]]:
+            if c in domains[x]:
+                domains[x].discard(c)
+                removed += 1
+                if len(domains[x]) <= 1:
+                    if not domains[x]:
+                        return False, removed
+                    queue.append(x)
+    return True, removed
+
+
+def solve_smart(graph, k, mrv=True, lcv=True, forward_check=True, use_ac3=False,
+                domains=None, max_nodes=None):
+    """
+    Colour `graph` with colours 0..k-1 by backtracking, with the heuristics on.
+
+    Args:
+        graph (Graph): What to colour.
+        k (int): How many colours.
+        mrv (bool): Next node = fewest colours left (ties: most neighbours).
+            Off = the fixed `bfs_order`.
+        lcv (bool): Try colours that block the fewest neighbours first.
+        forward_check (bool): Cross each new colour off the neighbours' lists.
+        use_ac3 (bool): Run `ac3` once before searching.
+        domains: Optional list of allowed colours per node (pre-coloured
+            nodes = a single colour), e.g. the givens of a Sudoku.
+        max_nodes (int): Give up after this many colour assignments.
+
+    Returns:
+        ColouringResult(colours, solved, nodes, backtracks, elapsed, prunings)
+    """
+    started = time.perf_counter()
+    n = graph.n
+    offsets, neighbours = graph._offsets, graph._neighbours
+    degree = graph.degree.tolist()
+    domains = _initial_domains(graph, k, domains)
+    colour = [UNCOLOURED] * n
+    nodes = backtracks = prunings = 0
+
+    def result(solved):
+        return ColouringResult(np.array(colour, dtype=np.int16), solved, nodes, backtracks,
+                               time.perf_counter() - started, prunings)
+
+    if use_ac3:
+        ok, prunings = ac3(graph, domains)
+        if not ok:
+            return result(False)
+    if any(not d for d in domains):
+        return result(False)
+
+    # MRV picks from a heap of (colours left, -degree, node). Entries go stale
+    # when a domain shrinks or grows, so every change pushes a fresh entry and
+    # stale ones get skipped when they come out (cheaper than re-sorting).
+    heap = [(len(d), -degree[v], v) for v, d in enumerate(domains)]
+    heapq.heapify(heap)
+    static = [] if mrv else bfs_order(graph)
+
+    def pick():
+        if not mrv:
+            return static[len(stack)]
+        while True:
+            size, _, v = heapq.heappop(heap)
+            if colour[v] == UNCOLOURED and size == len(domains[v]):
+                return v
+
+    def ordered_values(v):
+        values = sorted(domains[v])
+        if lcv:
+            # How many uncoloured neighbours would lose this colour?
+            nbrs = [u for u in neighbours[offsets[v]:offsets[v + 1]] if colour[u] == UNCOLOURED]
+            values.sort(key=lambda c: sum(c in domains[u] for u in nbrs))
+        return values
+
+    trail = []  # (node, colour) for every cross-off, newest last
+
+    def undo(mark):
+        while len(trail) > mark:
+            u, c = trail.pop()
+            domains[u].add(c)
+            if mrv:
+                heapq.heappush(heap, (len(domains[u]), -degree[u], u))
+
+    stack = []  # [node, colours to try, next index, trail length before it]
+    descend = True
+    while True:
+        if descend:
+            if len(stack) == n:
+                return result(True)
+            v = pick()
+            stack.append([v, ordered_values(v), 0, len(trail)])
+        frame = stack[-1]
+        v, values, i, mark = frame
+        undo(mark)
+        colour[v] = UNCOLOURED
+        descend = False
+        while i < len(values):
+            if max_nodes is not None and nodes >= max_nodes:
+                return result(False)
+            c = values[i]
+            i += 1
+            nbrs = neighbours[offsets[v]:offsets[v + 1]]
+            if not forward_check and any(colour[u] == c for u in nbrs):
+                continue  # Clashes with a coloured neighbour
+            colour[v] = c
+            nodes += 1
+            wiped_out = False
+            if forward_check:
+                for u in nbrs:
+                    if colour[u] == UNCOLOURED and c in domains[u]:
+                        domains[u].discard(c)
+                        trail.append((u, c))
+                        prunings += 1
+                        if mrv:
+                            heapq.heappush(heap, (len(domains[u]), -degree[u], u))
+                        if not domains[u]:
+                            wiped_out = True  # u has nothing left: this colour's a dead end
+                            break
+            if not wiped_out:
+                descend = True
+                break
+            undo(mark)
+            colour[v] = UNCOLOURED
+        frame[2] = i
+        if descend:
+            continue
+        # Out of colours for v: forget it and change the node before it
+        stack.pop()
+        backtracks += 1
+        if mrv:
+            heapq.heappush(heap, (len(domains[v]), -degree[v], v))
+        if not stack:
+            return result(False)
+
+
+def sudoku_graph(puzzle):
+    """
+    A Sudoku as graph colouring: 81 cells, 9 colours (the digits), and two
+    cells are neighbours if they share a row, column or 3x3 box.
+
+    Args:
+        puzzle (str): 81 characters, digits for givens, "0" or "." for blanks.
+
+    Returns:
+        (Graph, domains) ready for `solve_smart(graph, 9, domains=domains)`.
+        Colour c in the answer = digit c + 1.
+    """
+    cells = [ch for ch in puzzle if not ch.isspace()]
+    if len(cells) != 81:
+        raise ValueError(f"A Sudoku has 81 cells, got {len(cells)}")
+    edges = []
+    for a in range(81):
+        for b in range(a + 1, 81):
+            ra, ca, rb, cb = a // 9, a % 9, b // 9, b % 9
+            if ra == rb or ca == cb or (ra // 3, ca // 3) == (rb // 3, cb // 3):
+                edges.append((a, b))
+    domains = [{int(ch) - 1} if ch in "123456789" else set(range(9)) for ch in cells]
+    return Graph.from_edges(81, edges), domains
+
+
+if __name__ == "__main__":
+    # The islands from w5_map_colouring.py, as a graph (Bali next to everyone)
+    islands = Graph.from_adjacency({
+        "Sumatra": ["Java", "Bali"],
+        "Java": ["Kalimantan", "Bali"],
+        "Kalimantan": ["Bali"],
+    })
+    for k in (3, 2):
+        result = solve(islands, k)
+        names = ["Red", "Green", "Blue"]
+        picked = {islands.names[v]: names[c] for v, c in enumerate(result.colours) if c >= 0}
+        print(f"{k} colours: {picked if result.solved else 'FAILED'} "
+              f"({result.nodes} tries, {result.backtracks} backtracks)")
+
+    # A "map" with 40,000 regions: a 200x200 grid where every square also
+    # touches its bottom-right neighbour (a triangulated, planar map)
+    side = 200
+    ids = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate([
+        np.stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()], axis=1),
+        np.stack([ids[:-1, :].ravel(), ids[1:, :].ravel()], axis=1),
+        np.stack([ids[:-1, :-1].ravel(), ids[1:, 1:].ravel()], axis=1),
+    ])
+    big_map = Graph.from_edges(side * side, edges)
+    result = solve(big_map, 4)
+    print(f"{big_map}, 4 colours: solved={result.solved} valid={check_colouring(big_map, result.colours)} "
+          f"| {result.nodes} tries, {result.backtracks} backtracks in {result.elapsed:.2f}s")
+
+    # Register allocation: 20,000 variables, each "alive" for a stretch of the
+    # program; alive at the same time = can't share a register
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 200_000, size=20_000)
+    ends = starts + rng.integers(1, 100, size=20_000)
+    by_start = np.argsort(starts)
+    edges = []
+    active = []
+    needed = 0  # The most variables alive at once = the fewest registers possible
+    for v in by_start.tolist():
+        active = [u for u in active if ends[u] > starts[v]]
+        edges.extend((u, v) for u in active)
+        active.append(v)
+        needed = max(needed, len(active))
+    registers = Graph.from_edges(20_000, edges)
+    result = solve(registers, needed, order=by_start)
+    print(f"{registers}, {needed} registers: solved={result.solved} "
+          f"valid={check_colouring(registers, result.colours)} | {result.nodes} tries, "
+          f"{result.backtracks} backtracks in {result.elapsed:.2f}s")
+
+    # Strategy shoot-out on a hard Sudoku ("AI Escargot") - same search, more smarts
+    sudoku, givens = sudoku_graph(
+        "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..")
+    configs = {
+        "plain backtracking": dict(mrv=False, lcv=False, forward_check=False),
+        "+ forward checking": dict(mrv=False, lcv=False),
+        "+ MRV + degree": dict(lcv=False),
+        "+ LCV": dict(),
+        "+ AC-3 first": dict(use_ac3=True),
+    }
+    # (Heuristics are rules of thumb, not promises: LCV happens to LOSE on this
+    # one, and AC-3 only moves the givens' cross-offs to before the search.)
+    for label, options in configs.items():
+        result = solve_smart(sudoku, 9, domains=givens, max_nodes=200_000, **options)
+        print(f"Sudoku, {label:<20} solved={result.solved} | {result.nodes:>7} tries, "
+              f"{result.backtracks:>7} backtracks, {result.prunings:>7} prunings "
+              f"in {result.elapsed:.2f}s")
+    digits = "".join(str(c + 1) for c in result.colours)
+    print("\n".join(digits[r * 9:r * 9 + 9] for r in range(9)))
+
+    result = solve_smart(big_map, 4)
+    print(f"{big_map} with MRV+LCV+FC: solved={result.solved} "
+          f"valid={check_colouring(big_map, result.colours)} | {result.nodes} tries, "
+          f"{result.backtracks} backtracks in {result.elapsed:.2f}s")
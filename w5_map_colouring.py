@@ -87,12 +87,12 @@ def is_valid(assignment):
     return True  # All good, mate! No rules broken.
 
 # --- THE SOLVER (Backtracking Search) ---
-def solve_csp(assignment={}):
+def solve_csp(assignment=None):
     """
     Solve the map coloring problem using backtracking.
 
     Args:
-        assignment (dict): Current color assignments (starts empty).
+        assignment (dict): Current color assignments (None = start empty).
 
     Returns:
         dict or None: The final color assignment if solved, or `None` if no solution exists.
@@ -101,11 +101,19 @@ def solve_csp(assignment={}):
         This is like a `for` loop that tries every possible combination, but smarter.
         It "recursively" calls itself (like `setTimeout` calling itself) until it finds a solution.
     """
+    # A fresh blank coloring book every call! (A `={}` default would be ONE
+    # dict shared by every call, so a second solve would start half-colored.)
+    if assignment is None:
+        assignment = {}
+
     # Base Case: If all islands have a color, we're done!
     if len(assignment) == len(islands):
         return assignment  # Woohoo! We found a valid coloring.
 
     # Pick an island that hasn't been colored yet
+    # (For smarter picks - fewest colors left first, forward checking, AC-3 -
+    # see `solve_smart` in w5_csp_engine.py, and w5_dsatur.py for the bitset
+    # version that eats benchmark graphs. On 3 islands, this is plenty.)
     unassigned = [i for i in islands if i not in assignment]
     island = unassigned[0]  # Just pick the first one (order doesn't matter)
 
@@ -168,8 +176,10 @@ def is_valid_with_bali(assignment):
 colors_2 = ['Red', 'Green']
 print(f"\nTrying with only 2 colors: {colors_2}")
 
-def solve_csp_with_bali(assignment={}):
+def solve_csp_with_bali(assignment=None):
     """Solve with Bali and 2 colors (spoiler: it fails)."""
+    if assignment is None:
+        assignment = {}
     if len(assignment) == len(islands_with_bali):
         return assignment
 
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+MIN-CONFLICTS: Colour First, Fix the Fights Later 🩹🎨
+
+Backtracking (`w5_map_colouring.py`, `w5_csp_engine.py`) is careful: it
+never breaks a rule, and when it's stuck it goes back. On 100,000+ nodes
+that carefulness can take forever. Local search flips it around:
+1. Slap a colour on EVERY node straight away (some neighbours will clash).
+2. Pick a node that's in a fight, and give it the colour that clashes with
+   the fewest of its neighbours.
+3. Repeat until nobody's fighting (or time's up - then you still get the
+   best colouring seen, which is often nearly perfect).
+
+Making it fast:
+- **Incremental counts.** For every node we remember how many neighbours
+  wear each colour (`count[v][c]`). Recolouring v only changes its own
+  neighbours' counts, so a move is O(degree) - no re-checking the map.
+  The nodes in a fight live in a list we can add to, remove from and
+  pick from at random, all in O(1).
+- **Tabu.** After v leaves colour c, it can't go back to c for a few
+  steps (unless that would be a new best) - stops it flip-flopping.
+- **Random walk.** Every now and then, a totally random move, to shake
+  loose from a spot where every move looks bad.
+- **Restarts.** No progress for a while? Start over from a fresh start
+  colouring, shuffled differently (keeping the best one seen so far in
+  your pocket).
+
+No proof that it CAN'T be done (that's backtracking's job) - just a good
+answer, fast. Takes the same `Graph` as the backtracking solvers.
+
+JS Analogy:
+```js
+// Like fixing merge conflicts: you don't redo the whole codebase,
+// you just fix the files that are still red, one at a time.
+```
+"""
+
+# YOU NEED: pip install numpy
+import random
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from w5_csp_engine import Graph, check_colouring
+
+CLOCK_EVERY = 1024  # Look at the clock every this many moves
+
+# What `min_conflicts` hands back. `conflicts` = edges whose two ends still
+# match in `colours` (0 = solved); `steps` = moves made, across all restarts.
+LocalSearchResult = namedtuple("LocalSearchResult",
+                               ["colours", "solved", "conflicts", "steps", "restarts", "elapsed"])
+
+
+class _State:
+    """One colouring plus the counts that make each move O(degree)."""
+
+    def __init__(self, graph, k, colour):
+        self.k = k
+        self.offsets, self.neighbours = graph._offsets, graph._neighbours
+        self.colour = colour
+        # count[v * k + c] = how many of v's neighbours wear colour c
+        self.count = [0] * (graph.n * k)
+        self.fighting = []                  # Nodes with a same-coloured neighbour...
+        self.where = [-1] * graph.n         # ...and each one's spot in that list
+        offsets, neighbours, count = self.offsets, self.neighbours, self.count
+        for v in range(graph.n):
+            for u in neighbours[offsets[v]:offsets[v + 1]]:
+                count[u * k + colour[v]] += 1
+        self.conflicts = 0
+        for v in range(graph.n):
+            clashes = count[v * k + colour[v]]
+            if clashes:
+                self._join(v)
+                self.conflicts += clashes
+        self.conflicts //= 2  # Every clash got counted from both ends
+
+    def _join(self, v):
+        self.where[v] = len(self.fighting)
+        self.fighting.append(v)
+
+    def _leave(self, v):
+        # Swap v with the last one and pop: O(1), order doesn't matter
+        i, last = self.where[v], self.fighting[-1]
+        self.fighting[i] = last
+        self.where[last] = i
+        self.fighting.pop()
+        self.where[v] = -1
+
+    def move(self, v, c):
+        """Recolour v to c, keeping every count right. O(degree)."""
+        k, count, colour, where = self.k, self.count, self.colour, self.where
+        old = colour[v]
+        self.conflicts += count[v * k + c] - count[v * k + old]
+        colour[v] = c
+        for u in self.neighbours[self.offsets[v]:self.offsets[v + 1]]:
+            count[u * k + old] -= 1
+            count[u * k + c] += 1
+            cu = colour[u]
+            if cu == old and count[u * k + old] == 0 and where[u] >= 0:
+                self._leave(u)  # u's only clash was with v
+            elif cu == c and where[u] < 0:
+                self._join(u)   # u just got v as a clashing neighbour
+        if count[v * k + c]:
+            if where[v] < 0:
+                self._join(v)
+        elif where[v] >= 0:
+            self._leave(v)
+
+
+def _greedy_start(graph, k, rng):
+    # Visit nodes in a random order, each taking the colour its already-coloured
+    # neighbours use least. Way fewer clashes to fix than a purely random start.
+    offsets, neighbours = graph._offsets, graph._neighbours
+    colour = [0] * graph.n
+    seen = [0] * k
+    order = list(range(graph.n))
+    rng.shuffle(order)
+    done = bytearray(graph.n)
+    for v in order:
+        for c in range(k):
+            seen[c] = 0
+        for u in neighbours[offsets[v]:offsets[v + 1]]:
+            if done[u]:
+                seen[colour[u]] += 1
+        fewest = min(seen)
+        colour[v] = rng.choice([c for c in range(k) if seen[c] == fewest])
+        done[v] = 1
+    return colour
+
+
+def min_conflicts(graph, k, time_budget=10.0, max_steps=None, tabu_tenure=10, walk_prob=0.02,
+                  restart_after=None, max_restarts=None, seed=None, initial=None):
+    """
+    Colour `graph` with colours 0..k-1 by min-conflicts local search.
+
+    Args:
+        graph (Graph): What to colour.
+        k (int): How many colours.
+        time_budget (float): Wall-clock seconds before giving up (None = no limit).
+        max_steps (int): Moves before giving up (None = no limit).
+        tabu_tenure (int): Steps a node can't go back to the colour it left.
+        walk_prob (float): Chance of a random move instead of the best one.
+        restart_after (int): Moves without a new best before restarting
+            (default: 20 moves per node, at least 10,000).
+        max_restarts (int): Stop after this many restarts (None = no limit).
+        seed: Random seed (same seed + same budget in steps = same answer).
+        initial: A colouring to start from (e.g. a near-miss from an earlier
+            run) instead of a fresh greedy one. Restarts go back to greedy.
+
+    Returns:
+        LocalSearchResult(colours, solved, conflicts, steps, restarts, elapsed) -
+        the best colouring seen, even if time ran out before it was perfect.
+    """
+    if k < 1:
+        raise ValueError(f"Need at least 1 colour, got {k}")
+    if time_budget is None and max_steps is None and max_restarts is None:
+        raise ValueError("Local search never proves 'impossible' - give it a time_budget, "
+                         "max_steps or max_restarts so it knows when to stop")
+    started = time.perf_counter()
+    n = graph.n
+    rng = random.Random(seed)
+    restart_after = restart_after or max(10_000, 20 * n)
+    if initial is not None:
+        colour = [int(c) for c in initial]
+        if len(colour) != n or any(c < 0 or c >= k for c in colour):
+            raise ValueError(f"initial must give each of the {n} nodes a colour 0..{k - 1}")
+    else:
+        colour = _greedy_start(graph, k, rng)
+
+    best, best_conflicts = colour[:], None
+    steps = restarts = 0
+    tabu = [0] * (n * k)  # tabu[v * k + c] = first step v may wear c again
+    out_of_time = False
+    while True:
+        state = _State(graph, k, colour)
+        count, fighting = state.count, state.fighting
+        # Moves since this run's best, so we can rewind to it instead of
+        # copying all n colours every time the score improves
+        since_best = []
+        run_best = state.conflicts
+        stall = 0
+        # (With 1 colour there's nowhere to move: whatever clashes, stays)
+        while state.conflicts and k > 1 and stall < restart_after:
+            if max_steps is not None and steps >= max_steps:
+                out_of_time = True
+                break
+            if time_budget is not None and steps % CLOCK_EVERY == 0 \
+                    and time.perf_counter() - started > time_budget:
+                out_of_time = True
+                break
+            steps += 1
+            v = fighting[rng.randrange(len(fighting))]
+            old = colour[v]
+            base = v * k
+            if rng.random() < walk_prob:
+                c = rng.randrange(k - 1)
+                c += c >= old  # Any colour but the current one
+            else:
+                # Fewest clashes, skipping tabu colours - unless the move would
+                # beat the best score so far (the "aspiration" rule)
+                c, fewest = -1, None
+                for d in range(k):
+                    if d == old:
+                        continue
+                    clashes = count[base + d]
+                    if tabu[base + d] > steps and \
+                            state.conflicts + clashes - count[base + old] >= run_best:
+                        continue
+                    if fewest is None or clashes < fewest or (clashes == fewest and rng.random() < 0.5):
+                        c, fewest = d, clashes
+                if c < 0:
+                    continue  # Every other colour is tabu right now
+            tabu[base + old] = steps + tabu_tenure + rng.randrange(tabu_tenure + 1)
+            state.move(v, c)
+            since_best.append((v, old))
+            if state.conflicts < run_best:
+                run_best = state.conflicts
+                since_best.clear()
+                stall = 0
+            else:
+                stall += 1
+        # Rewind to this run's best, and keep it if it's the best of all runs
+        for v, old in reversed(since_best):
+            colour[v] = old
+        if best_conflicts is None or run_best < best_conflicts:
+            best, best_conflicts = colour[:], run_best
+        if best_conflicts == 0 or out_of_time or k == 1:
+            break
+        if max_restarts is not None and restarts >= max_restarts:
+            break
+        restarts += 1
+        colour = _greedy_start(graph, k, rng)
+        tabu = [0] * (n * k)
+
+    return LocalSearchResult(np.array(best, dtype=np.int16), best_conflicts == 0, best_conflicts,
+                             steps, restarts, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    from w5_dsatur import dsatur
+
+    # 1. A 100,000-node random graph: greedy DSATUR vs min-conflicts
+    rng = np.random.default_rng(1)
+    n, m = 100_000, 400_000
+    pairs = rng.integers(0, n, size=(m, 2))
+    random_graph = Graph.from_edges(n, pairs[pairs[:, 0] != pairs[:, 1]])
+    greedy = dsatur(random_graph, exact=False)
+    print(f"{random_graph}: greedy DSATUR needs {greedy.num_colours} colours "
+          f"({greedy.elapsed:.2f}s)")
+    for k in (greedy.num_colours, greedy.num_colours - 1):
+        result = min_conflicts(random_graph, k, time_budget=10, seed=0)
+        print(f"  min-conflicts, {k} colours: solved={result.solved} "
+              f"conflicts={result.conflicts} | {result.steps} moves, "
+              f"{result.restarts} restarts in {result.elapsed:.2f}s")
+
+    # 2. "Anytime": a 100,000-region map with 4 colours. Stop it whenever you
+    #    like and you get the best colouring so far - then carry on from it.
+    side = 316
+    ids = np.arange(side * side).reshape(side, side)
+    edges = np.concatenate([
+        np.stack([ids[:, :-1].ravel(), ids[:, 1:].ravel()], axis=1),
+        np.stack([ids[:-1, :].ravel(), ids[1:, :].ravel()], axis=1),
+        np.stack([ids[:-1, :-1].ravel(), ids[1:, 1:].ravel()], axis=1),
+    ])
+    big_map = Graph.from_edges(side * side, edges)
+    colours = None
+    for budget in (0, 1, 2, 5, 10):
+        result = min_conflicts(big_map, 4, time_budget=budget, seed=budget, initial=colours)
+        colours = result.colours
+        print(f"{big_map}, 4 colours, +{budget:>2}s: {result.conflicts:>6} clashing edges left "
+              f"(valid={check_colouring(big_map, colours)})")
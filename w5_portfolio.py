@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+PORTFOLIO: Send the Whole Crew Out, Ride Whoever Catches the Wave 🏄‍♀️🏄🏄‍♂️
+
+We've now got a quiver of colouring solvers, and none of them wins
+everywhere:
+- Backtracking (`w5_csp_engine.solve`) is great on maps, hopeless on
+  some tricky little graphs.
+- `solve_smart` / DSATUR (`w5_dsatur`) can PROVE "impossible", but can
+  crawl on huge graphs.
+- Min-conflicts (`w5_min_conflicts`) eats 100,000 nodes for breakfast,
+  but can never say "impossible".
+- Backtracking with random restarts: same search, different luck each time.
+
+So don't pick - run them ALL at once, each in its own process (its own CPU
+core), and take the first one back with an answer: a colouring (checked
+before we believe it) or a proof there isn't one. Everyone else gets
+stopped right there. We also write down WHO won, so after a few hundred real
+jobs you know which solver to try first.
+
+JS Analogy:
+```js
+// Promise.any() over a bunch of workers, then worker.terminate() the rest:
+const winner = await Promise.any(configs.map(c => runInWorker(c)));
+```
+"""
+
+# YOU NEED: pip install numpy
+import json
+import os
+import random
+import time
+from collections import Counter, deque, namedtuple
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from w5_csp_engine import Graph, check_colouring, solve, solve_smart
+from w5_dsatur import solve_bitset
+from w5_min_conflicts import min_conflicts
+
+STATUSES = ("solved", "impossible", "timeout", "error")
+
+# One solver set-up: a name for the records, which solver, and its options
+Config = namedtuple("Config", ["name", "solver", "options"])
+
+# What `run_portfolio` hands back. `status` is one of STATUSES ("error" =
+# EVERY config crashed, so nobody even tried); `winner` is the Config that
+# got there first (None on a timeout or error); `reports` maps each
+# config name to what it said ("solved", "impossible", "cancelled", ...).
+PortfolioResult = namedtuple("PortfolioResult",
+                             ["colours", "status", "winner", "elapsed", "reports"])
+
+DEFAULT_CONFIGS = [
+    Config("dsatur", "dsatur", {}),
+    Config("mrv-forward-check", "smart", {}),
+    Config("backtrack-bfs", "backtrack", {}),
+    Config("restarts-seed1", "restarts", {"seed": 1}),
+    Config("restarts-seed2", "restarts", {"seed": 2}),
+    Config("min-conflicts-seed1", "min_conflicts", {"seed": 1}),
+    Config("min-conflicts-seed2", "min_conflicts", {"seed": 2}),
+]
+
+
+def _random_bfs_order(graph, rng):
+    # `bfs_order`, but from random starting points and with each node's
+    # neighbours visited in a random order: same "stay local" idea, new luck
+    offsets, neighbours = graph._offsets, graph._neighbours
+    roots = list(range(graph.n))
+    rng.shuffle(roots)
+    seen = bytearray(graph.n)
+    order = []
+    for root in roots:
+        if seen[root]:
+            continue
+        seen[root] = 1
+        queue = deque([root])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            nbrs = neighbours[offsets[v]:offsets[v + 1]]
+            rng.shuffle(nbrs)
+            for u in nbrs:
+                if not seen[u]:
+                    seen[u] = 1
+                    queue.append(u)
+    return order
+
+
+def _restarts(graph, k, time_budget, seed=None, first_cutoff=1000, growth=2):
+    # Backtracking with a give-up point that doubles every restart. If a run
+    # ever finishes under its cutoff without a colouring, it searched
+    # EVERYTHING - that's a proof, not bad luck.
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    cutoff = first_cutoff
+    while time_budget is None or time.perf_counter() - started < time_budget:
+        result = solve(graph, k, order=_random_bfs_order(graph, rng), max_nodes=cutoff)
+        if result.solved:
+            return "solved", result.colours
+        if result.nodes < cutoff:
+            return "impossible", None
+        cutoff *= growth
+    return "timeout", None
+
+
+def _complete(result):
+    # For the backtrackers: no colouring = they searched everything = proof
+    return ("solved", result.colours) if result.solved else ("impossible", None)
+
+
+# The complete searches get no time budget of their own: they run until they
+# have an answer, and `run_portfolio` stops them if the whole race times out
+# (a budget-stop inside them would look exactly like a proof).
+def _backtrack(graph, k, time_budget, **options):
+    return _complete(solve(graph, k, **options))
+
+
+def _smart(graph, k, time_budget, **options):
+    return _complete(solve_smart(graph, k, **options))
+
+
+def _dsatur(graph, k, time_budget, **options):
+    return _complete(solve_bitset(graph, k, **options))
+
+
+def _local(graph, k, time_budget, **options):
+    result = min_conflicts(graph, k, time_budget=time_budget, **options)
+    return ("solved", result.colours) if result.solved else ("timeout", None)
+
+
+# name -> solver(graph, k, time_budget, **options) -> (status, colours or None)
+SOLVERS = {
+    "backtrack": _backtrack,
+    "smart": _smart,
+    "dsatur": _dsatur,
+    "restarts": _restarts,
+    "min_conflicts": _local,
+}
+
+
+def _portfolio_worker(conn, graph, k, config, time_budget):
+    # One process = one config. Sends back ONE message: (status, colours)
+    try:
+        status, colours = SOLVERS[config.solver](graph, k, time_budget, **config.options)
+    except Exception as error:  # A crashed solver mustn't take the portfolio down
+        status, colours = f"error: {error!r}", None
+    conn.send((status, colours))
+    conn.close()
+
+
+def run_portfolio(graph, k, configs=None, time_budget=60.0, log_path=None):
+    """
+    Race several solvers on the same colouring job; first real answer wins.
+
+    Args:
+        graph (Graph): What to colour.
+        k (int): How many colours.
+        configs: List of `Config(name, solver, options)`; `solver` is a key
+            of SOLVERS. Default: DEFAULT_CONFIGS (one process each).
+        time_budget (float): Seconds before everyone gets stopped.
+        log_path (str): Append one JSON line per job here (who won, how fast)
+            - feed it to `win_counts` later to pick better defaults.
+
+    Returns:
+        PortfolioResult(colours, status, winner, elapsed, reports)
+    """
+    configs = list(configs or DEFAULT_CONFIGS)
+    names = [c.name for c in configs]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Config names must be unique, got {names}")
+    for config in configs:
+        if config.solver not in SOLVERS:
+            raise ValueError(f"Unknown solver {config.solver!r} in {config.name!r}, "
+                             f"pick one of {sorted(SOLVERS)}")
+    started = time.perf_counter()
+    deadline = started + time_budget
+
+    running = {}  # connection -> (config, process), for everyone still racing
+    procs = []
+    for config in configs:
+        ours, theirs = Pipe(duplex=False)
+        proc = Process(target=_portfolio_worker, args=(theirs, graph, k, config, time_budget),
+                       daemon=True)
+        proc.start()
+        theirs.close()
+        running[ours] = (config, proc)
+        procs.append(proc)
+
+    reports = {name: "cancelled" for name in names}
+    colours, status, winner = None, "timeout", None
+    try:
+        while running and winner is None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            for conn in wait(list(running), timeout=remaining):
+                config, proc = running.pop(conn)
+                try:
+                    said, answer = conn.recv()
+                except EOFError:  # Died without a word (killed, out of memory...)
+                    said, answer = "error: worker died", None
+                conn.close()
+                if said == "solved" and not check_colouring(graph, answer):
+                    said = "error: returned an invalid colouring"  # Trust, but verify
+                reports[config.name] = said
+                if said in ("solved", "impossible") and winner is None:
+                    colours, status, winner = answer, said, config
+    finally:
+        # Everyone still out there: thanks, but we're done
+        for conn, (config, proc) in running.items():
+            if proc.is_alive():
+                proc.terminate()
+            conn.close()
+        for proc in procs:
+            proc.join()
+    if winner is None:
+        for config, _ in running.values():
+            reports[config.name] = "timeout"
+        if all(said.startswith("error") for said in reports.values()):
+            status = "error"  # Not "ran out of time" - a bug or a bad option, see `reports`
+
+    elapsed = time.perf_counter() - started
+    if log_path:
+        record = {"nodes": graph.n, "edges": len(graph.neighbours) // 2, "k": k,
+                  "status": status, "winner": winner and winner.name,
+                  "elapsed": round(elapsed, 4), "reports": reports}
+        with open(log_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    return PortfolioResult(colours, status, winner, elapsed, reports)
+
+
+def win_counts(log_path):
+    """How many jobs each config won, from a `run_portfolio` log (most wins first)."""
+    with open(log_path) as f:
+        winners = [json.loads(line)["winner"] for line in f if line.strip()]
+    return Counter(w for w in winners if w is not None).most_common()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from w5_dsatur import mycielski, queen_graph
+
+    print(f"{os.cpu_count() or 1} CPU core(s), {len(DEFAULT_CONFIGS)} solvers per job")
+
+    rng = np.random.default_rng(1)
+    n, m = 100_000, 400_000
+    pairs = rng.integers(0, n, size=(m, 2))
+    jobs = [
+        ("islands + Bali", Graph.from_adjacency({
+            "Sumatra": ["Java", "Bali"], "Java": ["Kalimantan", "Bali"],
+            "Kalimantan": ["Bali"]}), 2),
+        ("queen7_7", queen_graph(7), 7),
+        ("myciel4", mycielski(4), 4),
+        ("random 100k", Graph.from_edges(n, pairs[pairs[:, 0] != pairs[:, 1]]), 5),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "portfolio.jsonl")
+        for name, graph, k in jobs:
+            result = run_portfolio(graph, k, time_budget=60, log_path=log_path)
+            winner = result.winner.name if result.winner else "nobody"
+            print(f"{name:>15} ({graph}, {k} colours): {result.status} by {winner} "
+                  f"in {result.elapsed:.2f}s")
+        print(f"Wins so far: {win_counts(log_path)}")